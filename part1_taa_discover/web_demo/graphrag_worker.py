@@ -0,0 +1,83 @@
+"""
+TDS: Persistent GraphRAG Query Worker
+==================================================================
+
+Companion process for tds_app.py. Spawning `conda run -n graphrag_env
+graphrag query ...` per chat message pays fork+exec, interpreter startup,
+conda activation and the full GraphRAG import chain every time. This
+worker runs inside the graphrag environment, imports GraphRAG once, and
+then serves queries over a JSON-lines protocol:
+
+    stdin : {"root": "...", "method": "local|global", "query": "..."}
+    stdout: {"ok": true, "output": "...", "error": "..."}
+
+One response line is written per request line. A ready/fatal line is
+emitted on startup so the parent can fall back to the one-shot CLI when
+GraphRAG cannot be imported here.
+
+Usage:
+------
+    conda run -n graphrag_env --no-capture-output python -u graphrag_worker.py
+
+Author: xiet02
+License: MIT
+Repository: https://github.com/xiet02/TADA
+"""
+
+import io
+import json
+import sys
+from contextlib import redirect_stdout, redirect_stderr
+
+
+def _run_cli(app, root, method, query):
+    """Invoke the in-process GraphRAG CLI and capture its output."""
+    argv = ["query", "--root", root, "--method", method, "--query", query]
+    out_buf, err_buf = io.StringIO(), io.StringIO()
+    ok = True
+    err_text = ""
+
+    with redirect_stdout(out_buf), redirect_stderr(err_buf):
+        try:
+            app(argv, standalone_mode=False)
+        except SystemExit as e:
+            ok = e.code in (0, None)
+        except Exception as e:  # keep the worker alive on query errors
+            ok = False
+            err_text = str(e)
+
+    return {
+        "ok": ok,
+        "output": out_buf.getvalue(),
+        "error": err_text or err_buf.getvalue(),
+    }
+
+
+def main():
+    # Import once: this is the whole point of keeping the worker hot
+    try:
+        from graphrag.cli.main import app
+    except Exception as e:
+        print(json.dumps({"ok": False, "fatal": True,
+                          "error": f"graphrag import failed: {e}"}), flush=True)
+        return 1
+
+    print(json.dumps({"ok": True, "ready": True}), flush=True)
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            req = json.loads(line)
+            resp = _run_cli(app, req["root"],
+                            req.get("method", "global"), req["query"])
+        except Exception as e:
+            resp = {"ok": False, "output": "", "error": str(e)}
+        print(json.dumps(resp), flush=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
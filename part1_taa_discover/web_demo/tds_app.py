@@ -43,17 +43,53 @@ License: MIT
 Repository: https://github.com/xiet02/TADA
 """
 
+import functools
 import gradio as gr
+import heapq
+import json
 import subprocess
 import os
 import re
+import threading
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import ahocorasick
+    _AHOCORASICK_AVAILABLE = True
+except ImportError:
+    _AHOCORASICK_AVAILABLE = False
+
+try:
+    import cachetools.func
+    _CACHETOOLS_AVAILABLE = True
+except ImportError:
+    _CACHETOOLS_AVAILABLE = False
+
 # ============================================================================
 # Citation and Data Loading Functions
 # ============================================================================
 
+# Unix-style and Windows-style artifact paths, compiled once at import and
+# merged into a single alternation so the output text is scanned one time
+_CITATION_RE = re.compile(
+    r"output/artifacts/[\w\-/]+\.parquet"
+    r"|[A-Z]:\\[^\n]*?output\\artifacts\\[^\n]*?\.parquet"
+)
+
+# Tokens worth matching against the knowledge graph: 3+ alphanumerics
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]{3,}")
+
+# Upper bound on tokens fed to the matcher so its cost stays bounded on
+# long GraphRAG responses
+_MAX_TOKENS = 64
+
+
 def _parse_citations(text):
     """
     Extract parquet file citations from GraphRAG output.
@@ -68,40 +104,183 @@ def _parse_citations(text):
     Returns:
         list: Unique list of parquet file paths found in the text
     """
-    # Pattern 1: Unix-style paths to output artifacts
-    # Pattern 2: Windows-style paths to output artifacts
-    patterns = [
-        r"output/artifacts/[\w\-/]+\.parquet",
-        r"[A-Z]:\\[^\n]*?output\\artifacts\\[^\n]*?\.parquet",
-    ]
-    
-    found = []
-    for pattern in patterns:
-        found.extend(re.findall(pattern, text))
-    
     # Remove duplicates while preserving order
-    return list(dict.fromkeys(found))
+    return list(dict.fromkeys(_CITATION_RE.findall(text)))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_table_cached(path, mtime, columns):
+    """Decode a parquet file once per (path, mtime); mtime keys the cache."""
+    return pq.read_table(path, columns=list(columns) if columns else None)
 
 
-def _load_parquet(path):
+@functools.lru_cache(maxsize=8)
+def _searchable_columns(path, mtime):
     """
-    Safely load a parquet file with error handling.
-    
+    Pick the columns worth scanning from a parquet schema.
+
+    GraphRAG artifacts carry embedding vectors and numeric arrays that are
+    useless for token matching; only the string/binary columns (plus id and
+    title for display) need to be decoded. Parquet's columnar layout means
+    skipped columns are never read from disk.
+    """
+    schema = pq.ParquetFile(path).schema_arrow
+    cols = [
+        name for name, typ in zip(schema.names, schema.types)
+        if pa.types.is_string(typ) or pa.types.is_large_string(typ)
+        or pa.types.is_binary(typ)
+    ]
+    for name in ("id", "title"):
+        if name in schema.names and name not in cols:
+            cols.append(name)
+    return tuple(cols)
+
+
+def _load_table(path, columns=None):
+    """
+    Safely load a parquet file as an Arrow Table with error handling.
+
+    GraphRAG artifacts only change when the graph is re-indexed, so the
+    decoded Table is cached keyed on the file's mtime: repeat queries
+    skip the parquet decompression entirely. When `columns` is "search",
+    only the searchable string columns are projected (see
+    _searchable_columns); an explicit tuple is passed through as-is.
+
     Args:
         path (str): File path to parquet file
-        
+        columns: None, "search", or a tuple of column names to project
+
     Returns:
-        pd.DataFrame or None: DataFrame if successful, None otherwise
+        pa.Table or None: Table if successful, None otherwise
     """
     if not os.path.exists(path):
         return None
-    
+
+    try:
+        mtime = os.path.getmtime(path)
+        if columns == "search":
+            columns = _searchable_columns(path, mtime)
+        return _load_table_cached(path, mtime, columns)
+    except Exception:
+        return None
+
+
+def _to_pandas(table):
+    """
+    Arrow->pandas at the display boundary, keeping Arrow-backed dtypes.
+
+    types_mapper=pd.ArrowDtype leaves string columns as contiguous Arrow
+    buffers instead of synthesizing one Python str object per cell, and
+    split_blocks/self_destruct avoid holding a second copy during the
+    conversion. self_destruct consumes the Table: only pass throwaway
+    tables (take/slice/concat results), never one held by a cache.
+    """
+    return table.to_pandas(
+        split_blocks=True, self_destruct=True, types_mapper=pd.ArrowDtype
+    )
+
+
+def _load_parquet(path, columns=None):
+    """DataFrame view of _load_table, for callers that want pandas."""
+    table = _load_table(path, columns)
+    if table is None:
+        return None
+    # No self_destruct here: that would gut the Table owned by the
+    # _load_table_cached LRU and crash the next cache hit
+    return table.to_pandas(split_blocks=True, types_mapper=pd.ArrowDtype)
+
+
+# Directory of the derived hive-partitioned index (next to the artifacts)
+_SEARCH_INDEX_DIR = "search"
+
+
+def _build_index_partition(path):
+    """Flatten one artifact into its (id, title, searchable_text) table."""
+    table = _load_table(path, columns="search")
+    if table is None:
+        return None
+    str_cols = [
+        c for c in table.column_names
+        if pa.types.is_string(table.schema.field(c).type)
+        or pa.types.is_large_string(table.schema.field(c).type)
+    ]
+    if not str_cols:
+        return None
+    parts = [pc.fill_null(table[c].cast(pa.string()), "") for c in str_cols]
+    cols = {}
+    for name in ("id", "title"):
+        if name in table.column_names:
+            cols[name] = pc.cast(table[name], pa.string())
+        else:
+            cols[name] = pa.nulls(table.num_rows, pa.string())
+    # Stored lowercased so queries match case-sensitively with no
+    # per-query case folding
+    cols["searchable_text"] = pc.utf8_lower(
+        pc.binary_join_element_wise(*parts, "\x1f")
+    )
+    return pa.table(cols)
+
+
+def build_search_index(graph_root):
+    """
+    Build (or refresh) the slim hive-partitioned search index.
+
+    Scanning every string column of the full nodes/entities artifacts per
+    query decodes far more than token matching needs. Each artifact is
+    flattened into a compact (id, title, searchable_text) parquet under
+    search/source=<label>/, written with dictionary encoding, zstd and
+    small row groups carrying statistics. Keeping the two sources as hive
+    partitions of ONE dataset lets a single scan return both with the
+    source column populated from the path — no second file open and no
+    pandas-side concat. Partitions are rebuilt only when missing or older
+    than their source artifact.
+
+    Returns:
+        tuple or None: (index_dir, version) where version changes whenever
+        a partition is rewritten, or None if no partition can be built.
+    """
+    base = os.path.join(graph_root, "output", "artifacts")
+    sources = [
+        ("nodes", os.path.join(base, "create_final_nodes.parquet")),
+        ("entities", os.path.join(base, "create_final_entities.parquet")),
+    ]
+    out_dir = os.path.join(base, _SEARCH_INDEX_DIR)
+
     try:
-        return pd.read_parquet(path)
+        versions = []
+        for label, p in sources:
+            if not os.path.exists(p):
+                continue
+            part_path = os.path.join(out_dir, f"source={label}", "part-0.parquet")
+            if not (os.path.exists(part_path)
+                    and os.path.getmtime(part_path) >= os.path.getmtime(p)):
+                piece = _build_index_partition(p)
+                if piece is None:
+                    continue
+                os.makedirs(os.path.dirname(part_path), exist_ok=True)
+                pq.write_table(
+                    piece,
+                    part_path,
+                    compression="zstd",
+                    use_dictionary=True,
+                    write_statistics=True,
+                    row_group_size=8192,
+                )
+            versions.append(os.path.getmtime(part_path))
+
+        if not versions:
+            return None
+        return out_dir, max(versions)
     except Exception:
         return None
 
 
+@functools.lru_cache(maxsize=2)
+def _load_search_index_cached(index_dir, version):
+    """Materialize the partitioned search index in one dataset scan."""
+    return ds.dataset(index_dir, format="parquet", partitioning="hive").to_table()
+
+
 # ============================================================================
 # Configuration and Environment Setup
 # ============================================================================
@@ -132,6 +311,16 @@ if not CONDA_EXE or not os.path.exists(CONDA_EXE):
 SHOW_THINKING = os.environ.get("SHOW_THINKING", "0") == "1"  # Show query execution details
 SHOW_SOURCES = os.environ.get("SHOW_SOURCES", "0") == "1"    # Show artifact citations
 
+# Pre-warm the parquet cache so the first query doesn't pay the decode
+# cost - only worthwhile when the artifact scan actually runs (the
+# matched-records view is gated on SHOW_SOURCES)
+if SHOW_SOURCES:
+    for _p in (
+        os.path.join(GRAPH_RAG_ROOT, "output", "artifacts", "create_final_nodes.parquet"),
+        os.path.join(GRAPH_RAG_ROOT, "output", "artifacts", "create_final_entities.parquet"),
+    ):
+        _load_table(_p, columns="search")
+
 
 # ============================================================================
 # Utility Functions
@@ -155,6 +344,99 @@ def _fmt_cmd(cmd_list):
     return " ".join(q(str(s)) for s in cmd_list)
 
 
+def _match_mask(text, automaton, regex, lowercased=False):
+    """
+    Boolean mask of rows whose text contains any query token.
+
+    Tokens are lowercased when the matcher is built, so matching is
+    case-sensitive over lowercase text: pass lowercased=True when the
+    input is already lowercase (the search index) to skip the fold, which
+    is cheaper than per-character case folding inside the match kernel.
+    """
+    if not lowercased:
+        text = pc.utf8_lower(text)
+    if automaton is not None:
+        return pa.array(
+            [next(automaton.iter(s), None) is not None for s in text.to_pylist()],
+            type=pa.bool_(),
+        )
+    return pc.match_substring_regex(text, regex)
+
+
+# Columns holding identifiers that tokens hit as whole values, not substrings
+_EXACT_MATCH_COLS = ("id", "title", "name", "short_id")
+
+
+@functools.lru_cache(maxsize=8)
+def _match_columns_cached(path, mtime):
+    """Classify one artifact's columns once per mtime, not per query."""
+    table = _load_table_cached(path, mtime, _searchable_columns(path, mtime))
+    exact = tuple(c for c in _EXACT_MATCH_COLS if c in table.column_names)
+    narrative = tuple(
+        c for c in table.column_names
+        if c not in exact
+        and (pa.types.is_string(table.schema.field(c).type)
+             or pa.types.is_large_string(table.schema.field(c).type))
+    )
+    return exact, narrative
+
+
+def _match_columns(path):
+    """(exact identifier columns, narrative string columns) for one artifact."""
+    try:
+        return _match_columns_cached(path, os.path.getmtime(path))
+    except Exception:
+        return (), ()
+
+
+def _process_one(label, path, automaton, regex, token_values):
+    """
+    Load one artifact and return its token-filtered, source-tagged Table.
+
+    Identifier columns (id/title/name/short_id) are probed with a hashed
+    is_in lookup against the token set - an O(N) hash probe instead of a
+    substring scan. The remaining narrative string columns are joined
+    row-wise with a unit separator (so a match cannot span two columns)
+    and ONE matching pass runs over the combined array. The per-column
+    masks OR-reduce with or_kleene. The result stays an Arrow Table so
+    the caller can concatenate zero-copy.
+
+    Returns None when the artifact is missing/unreadable.
+    """
+    table = _load_table(path, columns="search")
+    if table is None:
+        return None
+
+    filtered = None
+    if automaton is not None or regex:
+        exact_cols, str_cols = _match_columns(path)
+        masks = []
+        if exact_cols and token_values:
+            value_set = pa.array(sorted(token_values))
+            for c in exact_cols:
+                masks.append(pc.is_in(
+                    pc.utf8_lower(pc.cast(table[c], pa.string())),
+                    value_set=value_set,
+                ))
+        if str_cols:
+            parts = [pc.fill_null(table[c].cast(pa.string()), "") for c in str_cols]
+            combined = pc.binary_join_element_wise(*parts, "\x1f")
+            masks.append(_match_mask(combined, automaton, regex))
+        if masks:
+            mask = pc.fill_null(functools.reduce(pc.or_kleene, masks), False)
+            # Take only the first 20 matching row indices: no full
+            # filtered-table copy when thousands of rows match
+            hits_idx = pc.indices_nonzero(mask)
+            if len(hits_idx):
+                filtered = table.take(hits_idx.slice(0, 20))
+
+    if filtered is None:
+        filtered = table.slice(0, 10)  # No tokens/matches, show first 10
+
+    # Add source label for tracking
+    return filtered.append_column("source", pa.array([label] * filtered.num_rows))
+
+
 def _build_df(message, output_text):
     """
     Build a DataFrame of relevant nodes and entities from GraphRAG artifacts.
@@ -175,48 +457,273 @@ def _build_df(message, output_text):
     nodes_path = os.path.join(base, "create_final_nodes.parquet")
     entities_path = os.path.join(base, "create_final_entities.parquet")
     
-    # Extract tokens (3+ alphanumeric characters) from query and response
-    tokens = set(re.findall(r"[A-Za-z0-9]{3,}", f"{message} {output_text}"))
-    
-    # Build regex pattern for token matching (longest tokens first for better matching)
+    # Extract tokens from query and response. finditer feeds the sets
+    # directly - no concatenated copy of the (possibly long) response and
+    # no intermediate match list. Every token of the (short) user query is
+    # kept; the response only contributes likely entity names (>= 6 chars
+    # or containing uppercase), longest first, up to the _MAX_TOKENS cap.
+    tokens = {m.group() for m in _TOKEN_RE.finditer(message)}
+    budget = _MAX_TOKENS - len(tokens)
+    if budget > 0:
+        response_tokens = {
+            t for t in (m.group() for m in _TOKEN_RE.finditer(output_text))
+            if len(t) >= 6 or any(ch.isupper() for ch in t)
+        }
+        tokens.update(heapq.nlargest(budget, response_tokens - tokens, key=len))
+
+    # The tokens are plain literals, so multi-literal matching fits better
+    # than a giant alternation regex (which backtracks badly once the
+    # response contributes hundreds of tokens): an Aho-Corasick automaton
+    # scans each row once regardless of token count. The union regex
+    # (longest tokens first) remains the fallback when the package is
+    # missing.
+    automaton = None
+    regex = None
+    token_values = {t.lower() for t in tokens}
     if tokens:
-        regex = "|".join(sorted({re.escape(t) for t in tokens}, key=len, reverse=True))
-    else:
-        regex = None
-    
-    frames = []
-    
-    # Process both nodes and entities
-    for label, p in [("nodes", nodes_path), ("entities", entities_path)]:
-        df = _load_parquet(p)
-        if df is None:
-            continue
-        
-        # Filter DataFrame based on token matches in string columns
-        if regex:
-            mask = False
-            for c in df.columns:
-                if df[c].dtype == object:
-                    m = df[c].astype(str).str.contains(regex, case=False, na=False)
-                    mask = m if isinstance(mask, bool) else (mask | m)
-            
-            if isinstance(mask, bool):
-                filtered = df.head(10)  # No matches, show first 10
-            else:
-                filtered = df[mask].head(20)  # Show matching rows
+        if _AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for t in {t.lower() for t in tokens}:
+                automaton.add_word(t, t)
+            automaton.make_automaton()
         else:
-            filtered = df.head(10)  # No tokens, show first 10
-        
-        # Add source label for tracking
-        filtered = filtered.copy()
-        filtered["source"] = label
-        frames.append(filtered)
+            regex = "|".join(sorted({re.escape(t.lower()) for t in tokens}, key=len, reverse=True))
     
-    # Combine all DataFrames
-    if not frames:
+    # Fast path: the derived slim index holds one searchable_text per row,
+    # so a query scans one compact dataset instead of both full artifacts
+    idx = build_search_index(GRAPH_RAG_ROOT)
+    table = None
+    if idx is not None:
+        try:
+            table = _load_search_index_cached(*idx)
+        except Exception:
+            table = None
+    if table is not None:
+        filtered = None
+        if automaton is not None or regex:
+            mask = _match_mask(table["searchable_text"], automaton, regex,
+                               lowercased=True)
+            hits_idx = pc.indices_nonzero(mask)
+            if len(hits_idx):
+                filtered = table.take(hits_idx.slice(0, 20))
+        if filtered is None:
+            filtered = table.slice(0, 10)
+        return _to_pandas(filtered)
+
+    # Fallback (no index): scan the raw artifacts concurrently - their
+    # work is independent and pyarrow releases the GIL inside the decode
+    # and compute kernels, so wall time is roughly the max, not the sum
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        futures = [
+            ex.submit(_process_one, label, p, automaton, regex, token_values)
+            for label, p in [("nodes", nodes_path), ("entities", entities_path)]
+        ]
+        tables = [f.result() for f in futures]
+    tables = [t for t in tables if t is not None]
+
+    if not tables:
         return pd.DataFrame()
-    
-    return pd.concat(frames, ignore_index=True)
+
+    # Zero-copy Arrow concat (missing columns promote to null), one
+    # pandas conversion at the very boundary
+    combined = pa.concat_tables(tables, promote_options="permissive")
+    return _to_pandas(combined)
+
+
+# ============================================================================
+# Persistent GraphRAG Worker
+# ============================================================================
+
+# One long-lived child inside graphrag_env (see graphrag_worker.py)
+# amortizes interpreter startup, conda activation and GraphRAG imports
+# across all queries instead of re-paying them per chat message.
+_WORKER = None
+
+
+def _worker_cmd():
+    """Command line that launches the persistent worker in graphrag_env."""
+    return [
+        CONDA_EXE if CONDA_EXE else "conda",
+        "run", "-n", "graphrag_env",
+        "--no-capture-output",
+        "python", "-u",
+        str(Path(__file__).parent / "graphrag_worker.py"),
+    ]
+
+
+def _drain_stderr(stream):
+    """Discard a child's stderr so a full pipe can never block it."""
+    try:
+        for _line in stream:
+            pass
+    except Exception:
+        pass
+
+
+def _get_worker():
+    """Return the live worker process, spawning it on first use."""
+    global _WORKER
+    if _WORKER is not None and _WORKER.poll() is None:
+        return _WORKER
+
+    try:
+        w = subprocess.Popen(
+            _worker_cmd(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            shell=False,
+        )
+    except Exception:
+        return None
+
+    try:
+        # First line reports whether GraphRAG imported inside the env
+        ready = json.loads(w.stdout.readline() or "{}")
+        if not ready.get("ok"):
+            w.kill()
+            return None
+    except Exception:
+        # Handshake failed (e.g. something else echoed on stdout): don't
+        # leak the spawned child, one would pile up per query otherwise
+        try:
+            w.kill()
+        except Exception:
+            pass
+        return None
+
+    # GraphRAG logs freely to stderr; with nobody reading it the 64 KiB
+    # pipe buffer would eventually fill and wedge the worker mid-query.
+    # A daemon thread keeps it drained for the worker's whole lifetime.
+    threading.Thread(target=_drain_stderr, args=(w.stderr,), daemon=True).start()
+
+    _WORKER = w
+    return w
+
+
+def _drop_worker():
+    """Discard a dead/wedged worker so the next query respawns it."""
+    global _WORKER
+    if _WORKER is not None:
+        try:
+            _WORKER.kill()
+        except Exception:
+            pass
+        _WORKER = None
+
+
+def _query_via_worker(message, method):
+    """
+    Run one query on the persistent worker.
+
+    Returns:
+        tuple or None: (output, error, returncode), or None if the worker
+        is unavailable (caller falls back to the one-shot CLI).
+    """
+    worker = _get_worker()
+    if worker is None:
+        return None
+
+    try:
+        worker.stdin.write(json.dumps(
+            {"root": GRAPH_RAG_ROOT, "method": method, "query": message}
+        ) + "\n")
+        worker.stdin.flush()
+        line = worker.stdout.readline()
+        resp = json.loads(line) if line.strip() else None
+    except Exception:
+        resp = None
+
+    if resp is None:
+        _drop_worker()
+        return None
+
+    return (
+        resp.get("output", "") or "",
+        resp.get("error", "") or "",
+        0 if resp.get("ok") else 1,
+    )
+
+
+def _run_graphrag(message, method):
+    """
+    Execute one GraphRAG query via the worker or the one-shot CLI.
+
+    Returns:
+        tuple: (output, error, returncode, cmd_used) - returncode is -1
+        with `error` set when the CLI could not even be spawned.
+    """
+    worker_result = _query_via_worker(message, method)
+    if worker_result is not None:
+        acc, err, rc = worker_result
+        return acc, err, rc, _fmt_cmd(_worker_cmd()) + " (persistent worker)"
+
+    # Fallback: one-shot GraphRAG CLI invocation
+    cmd_main = [
+        CONDA_EXE if CONDA_EXE else "conda",  # Conda executable
+        "run", "-n", "graphrag_env",           # Run in graphrag_env
+        "--no-capture-output",                 # Stream output
+        "graphrag", "query",                   # GraphRAG query command
+        "--root", GRAPH_RAG_ROOT,              # Knowledge graph root
+        "--method", method,                    # Search method
+        "--query", message,                    # User query
+    ]
+
+    try:
+        proc = subprocess.Popen(
+            cmd_main,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            shell=False
+        )
+    except Exception as e:
+        return "", str(e), -1, _fmt_cmd(cmd_main)
+
+    # Drain both pipes with one bulk read per stream: communicate() reads
+    # stdout and stderr concurrently, so no quadratic per-line string
+    # concatenation and no stall if the child fills the stderr pipe
+    out, err = proc.communicate()
+    return out or "", err or "", proc.returncode, _fmt_cmd(cmd_main)
+
+
+def _artifacts_version():
+    """mtime of the artifacts dir; changes when the graph is re-indexed."""
+    try:
+        return os.path.getmtime(os.path.join(GRAPH_RAG_ROOT, "output", "artifacts"))
+    except OSError:
+        return 0.0
+
+
+class _QueryFailed(Exception):
+    """Raised inside the cache wrapper so failed queries are never cached."""
+
+    def __init__(self, result):
+        super().__init__(result[1])
+        self.result = result
+
+
+if _CACHETOOLS_AVAILABLE:
+    _response_cache = cachetools.func.ttl_cache(maxsize=256, ttl=3600)
+else:
+    _response_cache = functools.lru_cache(maxsize=256)
+
+
+@_response_cache
+def _graphrag_query_cached(message, method, artifacts_version):
+    """
+    Memoized GraphRAG execution.
+
+    Users routinely re-ask the same question (retry, refresh, example
+    click); repeats skip the seconds-long GraphRAG invocation entirely.
+    `artifacts_version` is part of the key so a re-index invalidates old
+    answers; failures raise and therefore stay uncached.
+    """
+    result = _run_graphrag(message, method)
+    if result[2] != 0:
+        raise _QueryFailed(result)
+    return result
 
 
 # ============================================================================
@@ -245,33 +752,19 @@ def graphrag_query(message, history, method):
     """
     # Currently hardcoded to global search (can be parameterized if needed)
     method_used = "global"
-    acc = ""  # Accumulator for stdout
-    
-    # Build GraphRAG query command
-    cmd_main = [
-        CONDA_EXE if CONDA_EXE else "conda",  # Conda executable
-        "run", "-n", "graphrag_env",           # Run in graphrag_env
-        "--no-capture-output",                 # Stream output
-        "graphrag", "query",                   # GraphRAG query command
-        "--root", GRAPH_RAG_ROOT,              # Knowledge graph root
-        "--method", method_used,               # Search method
-        "--query", message,                    # User query
-    ]
-    
-    # Execute GraphRAG query
+
+    # Repeat questions are answered from the response cache; only cache
+    # misses (and failures, which stay uncached) actually run GraphRAG
     try:
-        proc = subprocess.Popen(
-            cmd_main,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            shell=False
+        acc, err, rc, cmd_used = _graphrag_query_cached(
+            message, method_used, _artifacts_version()
         )
-        cmd_used = _fmt_cmd(cmd_main)
-    except Exception as e:
-        # Handle execution errors
-        err_text = str(e)
-        modal = f"### Query Error\n\n{err_text}\n\nCommand: {_fmt_cmd(cmd_main)}"
+    except _QueryFailed as e:
+        acc, err, rc, cmd_used = e.result
+
+    # Spawn failures have no output at all: surface the error modal
+    if rc == -1:
+        modal = f"### Query Error\n\n{err}\n\nCommand: {cmd_used}"
         return (
             None,
             gr.update(value="", visible=True),    # Show overlay
@@ -279,15 +772,6 @@ def graphrag_query(message, history, method):
             gr.update(visible=True)                # Show close button
         )
     
-    # Stream stdout line by line
-    if proc.stdout is not None:
-        for line in proc.stdout:
-            acc += line
-    
-    # Wait for process completion
-    rc = proc.wait()
-    err = proc.stderr.read() if proc.stderr is not None else ""
-    
     # Handle non-zero return codes
     if rc != 0:
         if not acc.strip():
@@ -301,27 +785,45 @@ def graphrag_query(message, history, method):
     
     # Parse citations from output
     citations = _parse_citations(acc)
-    
+
     # Build thinking/debug section
     thinking = f"Command: {cmd_used}"
+
+    # Build sources section (generator feeds join directly, no temp list)
+    sources_md = "\n".join("- " + c for c in citations) if citations else "- No artifact references found."
+
+    # Matching graph records are only computed when a details section will
+    # actually display them - skipping two parquet scans per query in the
+    # common flags-off deployment
+    if SHOW_SOURCES:
+        context_df = _build_df(message, acc)
+        if context_df is not None and not context_df.empty:
+            cols = [c for c in ("source", "id", "title") if c in context_df.columns]
+            if cols:
+                sources_md += (
+                    "\n\n**Matched graph records:**\n\n```\n"
+                    + context_df[cols].to_string(index=False)
+                    + "\n```"
+                )
     
-    # Build sources section
-    sources_md = "\n".join([f"- {c}" for c in citations]) if citations else "- No artifact references found."
-    
-    # Assemble optional details sections
-    details = ""
-    
+    # Assemble optional details sections: collect parts and join once
+    # instead of reallocating the string on every +=
+    parts = []
+
     if SHOW_THINKING:
-        details += "\n\n<details><summary>Thinking</summary>\n" + thinking + "\n</details>\n"
-    
+        parts.append("\n\n<details><summary>Thinking</summary>\n" + thinking + "\n</details>\n")
+
     if SHOW_SOURCES:
-        details += "<details><summary>Sources</summary>\n" + sources_md + "\n</details>\n"
-    
+        parts.append("<details><summary>Sources</summary>\n" + sources_md + "\n</details>\n")
+
     # Include warnings/errors if present
-    if err.strip():
-        details += (
-            "\n\n<details><summary>Warnings</summary>\n" + err.strip() + "\n</details>\n"
+    err_stripped = err.strip()
+    if err_stripped:
+        parts.append(
+            "\n\n<details><summary>Warnings</summary>\n" + err_stripped + "\n</details>\n"
         )
+
+    details = "".join(parts)
     
     # Format final response
     reply_text = acc.strip() if acc.strip() else ""
@@ -0,0 +1,106 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+# cython: language_level=3
+"""
+AbDesign: Cython mutagenesis kernel
+==================================================================
+
+C implementation of the CDR mutation hot loop from
+step0_generate_library.py. Operates on a typed byte buffer with a
+precomputed allowed-replacement table and a splitmix64 RNG, avoiding all
+per-position Python object work.
+
+Build:
+------
+    python setup_mutate_cy.py build_ext --inplace
+
+step0_generate_library.py falls back to the pure-Python path when this
+extension has not been compiled.
+
+Author: xiet02
+License: MIT
+Repository: https://github.com/xiet02/TADA
+"""
+
+from cpython cimport array
+import array
+
+from libc.stdint cimport uint64_t
+
+cdef const unsigned char* AA_SET = b"ACDEFGHIKLMNPQRSTVWY"
+
+# ALLOWED[i]: replacement bytes for original residue index i
+# (alphabet minus Cysteine minus the residue itself)
+cdef unsigned char ALLOWED[20][19]
+cdef int ALLOWED_N[20]
+cdef int AA_INDEX[256]
+
+cdef void _init_tables():
+    cdef int i, j, k
+    for i in range(256):
+        AA_INDEX[i] = -1
+    for i in range(20):
+        AA_INDEX[AA_SET[i]] = i
+    for i in range(20):
+        k = 0
+        for j in range(20):
+            if j == i or AA_SET[j] == c'C':
+                continue
+            ALLOWED[i][k] = AA_SET[j]
+            k += 1
+        ALLOWED_N[i] = k
+
+_init_tables()
+
+
+cdef inline uint64_t _splitmix64(uint64_t* state) nogil:
+    cdef uint64_t z
+    state[0] += <uint64_t>0x9E3779B97F4A7C15
+    z = state[0]
+    z = (z ^ (z >> 30)) * <uint64_t>0xBF58476D1CE4E5B9
+    z = (z ^ (z >> 27)) * <uint64_t>0x94D049BB133111EB
+    return z ^ (z >> 31)
+
+
+cdef inline int _randbelow(uint64_t* state, int n) nogil:
+    return <int>(_splitmix64(state) % <uint64_t>n)
+
+
+def mutate(bytes seq, positions, int n_mut, uint64_t seed):
+    """
+    Mutate n_mut distinct residues of seq at indices drawn from positions.
+
+    Args:
+        seq (bytes): ASCII amino-acid sequence.
+        positions: eligible 0-based indices (list/sequence of int).
+        n_mut (int): number of distinct positions to mutate.
+        seed (int): 64-bit seed for the internal RNG.
+
+    Returns:
+        tuple: (mutated bytes, list of mutated positions)
+    """
+    cdef uint64_t state = seed
+    cdef bytearray buf = bytearray(seq)
+    cdef unsigned char[::1] view = buf
+    cdef array.array pos_arr = array.array("i", positions)
+    cdef int[::1] pos = pos_arr
+    cdef int npos = pos.shape[0]
+    cdef int i, j, idx, ai, tmp
+
+    if n_mut > npos:
+        raise ValueError("n_mut larger than position pool")
+
+    # Partial Fisher-Yates: first n_mut entries become the sample
+    for i in range(n_mut):
+        j = i + _randbelow(&state, npos - i)
+        tmp = pos[i]
+        pos[i] = pos[j]
+        pos[j] = tmp
+
+    mut_positions = []
+    for i in range(n_mut):
+        idx = pos[i]
+        ai = AA_INDEX[view[idx]]
+        view[idx] = ALLOWED[ai][_randbelow(&state, ALLOWED_N[ai])]
+        mut_positions.append(idx)
+
+    return bytes(buf), mut_positions
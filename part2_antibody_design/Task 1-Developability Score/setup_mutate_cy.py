@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""Build helper for the optional Cython mutagenesis kernel.
+
+Usage:
+------
+    python setup_mutate_cy.py build_ext --inplace
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="mutate_cy",
+    ext_modules=cythonize("mutate_cy.pyx", language_level=3),
+)
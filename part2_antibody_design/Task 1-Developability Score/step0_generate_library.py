@@ -21,6 +21,7 @@ Features:
 Requirements:
 -------------
 - python >= 3.8
+- numpy (optional, enables vectorized library generation)
 
 Usage:
 ------
@@ -32,9 +33,24 @@ Repository: https://github.com/xiet02/TADA
 """
 
 import argparse
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    # Compiled via: python setup_mutate_cy.py build_ext --inplace
+    from mutate_cy import mutate as _mutate_c
+    _CYTHON_AVAILABLE = True
+except ImportError:
+    _CYTHON_AVAILABLE = False
+
+try:
+    import numpy as np
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    _NUMPY_AVAILABLE = False
+
 # ============================================================================
 # Sequence Definitions (Tezepelumab & TSLP)
 # ============================================================================
@@ -62,6 +78,14 @@ TSLP_SEQ = (
     "TQAMKKRRKRKVTTNKCLEQVSQLQGLWRRFNRPLLKQQ"
 )
 
+# scFv linker and complex suffix are constant across the library; build once
+LINKER = "GGGGS" * 3
+LINKER_BYTES = LINKER.encode("ascii")
+COMPLEX_SUFFIX_BYTES = b":" + TSLP_SEQ.encode("ascii")
+
+# Flush accumulated FASTA blocks every this many variants
+WRITE_CHUNK = 1000
+
 # ============================================================================
 # CDR Configuration (Kabat Numbering)
 # ============================================================================
@@ -80,7 +104,28 @@ CDR_POS_H = sorted(set(H1 + H2 + H3))
 CDR_POS_L = sorted(set(L1 + L2 + L3))
 
 # Amino acid alphabet (excluding Cysteine to avoid unpaired disulfides)
-AA_SET = "ACDEFGHIKLMNPQRSTVWY"  
+AA_SET = "ACDEFGHIKLMNPQRSTVWY"
+
+# Replacement table built once at import: for each original residue (byte),
+# the alphabet minus Cysteine and minus the residue itself.
+ALLOWED = {
+    ord(aa): tuple(ord(a) for a in AA_SET if a != aa and a != "C")
+    for aa in AA_SET
+}
+
+if _NUMPY_AVAILABLE:
+    # Vectorized-mutagenesis tables: templates as uint8, CDR index arrays,
+    # and a (256, 19) replacement matrix indexed by original byte
+    VH_BYTES = np.frombuffer(VH_TEMPLATE.encode("ascii"), dtype=np.uint8)
+    VL_BYTES = np.frombuffer(VL_TEMPLATE.encode("ascii"), dtype=np.uint8)
+    CDR_POS_H_NP = np.asarray(CDR_POS_H, dtype=np.int64)
+    CDR_POS_L_NP = np.asarray(CDR_POS_L, dtype=np.int64)
+
+    ALLOWED_TABLE = np.zeros((256, 19), dtype=np.uint8)
+    ALLOWED_N = np.ones(256, dtype=np.int64)  # 1 avoids zero-range draws
+    for _code, _repl in ALLOWED.items():
+        ALLOWED_TABLE[_code, : len(_repl)] = _repl
+        ALLOWED_N[_code] = len(_repl)
 
 
 # ============================================================================
@@ -90,13 +135,13 @@ AA_SET = "ACDEFGHIKLMNPQRSTVWY"
 def mutate_sequence(seq, positions, mut_fraction, rng=None):
     """
     Mutate a specific fraction of residues within defined positions.
-    
+
     Args:
         seq (str): The amino acid sequence to mutate.
         positions (list): List of 0-based indices eligible for mutation.
         mut_fraction (float): Fraction of positions to mutate.
         rng (random.Random): Random number generator instance.
-        
+
     Returns:
         tuple: (mutated_sequence, list_of_mutated_positions)
     """
@@ -105,62 +150,151 @@ def mutate_sequence(seq, positions, mut_fraction, rng=None):
 
     n_pos = len(positions)
     # Fixed count override based on paper methodology (example: 6 mutations)
-    n_mut = 6 
+    n_mut = 6
+
+    if _CYTHON_AVAILABLE:
+        # C kernel: typed buffer + C RNG, seeded from the caller's stream
+        mutated, mut_positions = _mutate_c(
+            seq.encode("ascii"), positions, n_mut, rng.getrandbits(64)
+        )
+        return mutated.decode("ascii"), mut_positions
 
     mut_positions = rng.sample(positions, n_mut)
-    seq_list = list(seq)
+    buf = bytearray(seq.encode("ascii"))
 
     # print(f"[DEBUG] Mutating positions: {mut_positions}")
 
     for idx in mut_positions:
-        orig = seq_list[idx]
-        # Exclude Cysteine and the original amino acid
-        allowed = [aa for aa in AA_SET if aa != orig and aa != "C"]
-        new_aa = rng.choice(allowed)
-        seq_list[idx] = new_aa
+        # Exclude Cysteine and the original amino acid via the lookup table
+        buf[idx] = rng.choice(ALLOWED[buf[idx]])
+
+    return buf.decode("ascii"), mut_positions
+
 
-    return "".join(seq_list), mut_positions
+def _mutate_batch(template_bytes, cdr_pos, n_variants, n_mut, rng):
+    """
+    Mutate all variants of one chain in a single set of NumPy operations.
+
+    Args:
+        template_bytes (np.ndarray): uint8 template sequence.
+        cdr_pos (np.ndarray): eligible template indices (CDR positions).
+        n_variants (int): number of rows to generate.
+        n_mut (int): distinct mutations per variant.
+        rng (np.random.Generator): NumPy random generator.
+
+    Returns:
+        np.ndarray: (n_variants, L) uint8 matrix of mutated sequences.
+    """
+    M = np.broadcast_to(template_bytes, (n_variants, template_bytes.size)).copy()
+
+    # Sample n_mut distinct CDR slots per row: argpartition of random keys
+    keys = rng.random((n_variants, cdr_pos.size))
+    sel = np.argpartition(keys, n_mut, axis=1)[:, :n_mut]
+    idx = cdr_pos[sel].ravel()
+    rows = np.repeat(np.arange(n_variants), n_mut)
+
+    # Replacement draw excludes Cysteine and the original residue by table
+    orig = M[rows, idx]
+    j = rng.integers(0, ALLOWED_N[orig])
+    M[rows, idx] = ALLOWED_TABLE[orig, j]
+    return M
+
+
+def _generate_chunk(task):
+    """
+    Worker: generate variants for an index sub-range with its own RNG.
+
+    Args:
+        task (tuple): (start, end, chunk_seed, mut_fraction).
+
+    Returns:
+        list: (var_name, fv_seq) tuples for indices [start, end).
+    """
+    start, end, chunk_seed, mut_fraction = task
+    rng = random.Random(chunk_seed)
+    records = []
+
+    for i in range(start, end):
+        vh_mut, _ = mutate_sequence(VH_TEMPLATE, CDR_POS_H, mut_fraction, rng)
+        vl_mut, _ = mutate_sequence(VL_TEMPLATE, CDR_POS_L, mut_fraction, rng)
+
+        # Construct scFv: VH - (GGGGS)3 - VL
+        fv_seq = (vh_mut + LINKER + vl_mut).encode("ascii")
+        records.append((f"tezepelumab_var_{i:04d}", fv_seq))
+
+    return records
 
 
 def generate_library(n_variants: int, out_prefix: str, mut_fraction: float = 0.02, seed: int = 42):
     """
     Generate the variant library and write FASTA files.
 
+    Large libraries are partitioned across worker processes, each seeded
+    deterministically from the master seed; output order is preserved.
+
     Args:
         n_variants (int): Number of variants to generate.
         out_prefix (str): Prefix for output filenames.
         mut_fraction (float): Target mutation rate.
         seed (int): Random seed for reproducibility.
     """
-    rng = random.Random(seed)
-
     # Output paths
     fv_fasta = Path(f"{out_prefix}_fv.fasta")           # For structural checks
     complex_fasta = Path(f"{out_prefix}_complex.fasta") # For docking (AlphaFold)
 
     print(f"[INFO] Generating {n_variants} variants with seed {seed}...")
 
-    with fv_fasta.open("w") as f_fv, complex_fasta.open("w") as f_cx:
+    n_workers = os.cpu_count() or 1
+    if _NUMPY_AVAILABLE:
+        # Whole-library mutagenesis as a few vectorized NumPy calls
+        rng_np = np.random.default_rng(seed)
+        mh = _mutate_batch(VH_BYTES, CDR_POS_H_NP, n_variants, 6, rng_np)
+        ml = _mutate_batch(VL_BYTES, CDR_POS_L_NP, n_variants, 6, rng_np)
+        records = [
+            (
+                f"tezepelumab_var_{i + 1:04d}",
+                mh[i].tobytes() + LINKER_BYTES + ml[i].tobytes(),
+            )
+            for i in range(n_variants)
+        ]
+    elif n_variants >= 1000 and n_workers > 1:
+        # Partition the index range; per-chunk seeds come from the master RNG
+        step = (n_variants + n_workers - 1) // n_workers
+        master = random.Random(seed)
+        tasks = [
+            (lo, min(lo + step, n_variants + 1), master.getrandbits(64), mut_fraction)
+            for lo in range(1, n_variants + 1, step)
+        ]
+        with ProcessPoolExecutor(max_workers=n_workers) as ex:
+            records = [r for chunk in ex.map(_generate_chunk, tasks) for r in chunk]
+    else:
+        records = _generate_chunk((1, n_variants + 1, seed, mut_fraction))
+
+    # Binary handles with a large buffer skip TextIOWrapper's per-write
+    # encode step; all record parts are already bytes
+    with fv_fasta.open("wb", buffering=1 << 22) as f_fv, \
+         complex_fasta.open("wb", buffering=1 << 22) as f_cx:
         # Write reference (var0000)
         # Note: Logic implies 1-N generated, 0 is usually added manually or implied.
-        
-        for i in range(1, n_variants + 1):
-            vh_mut, h_mutpos = mutate_sequence(VH_TEMPLATE, CDR_POS_H, mut_fraction, rng)
-            vl_mut, l_mutpos = mutate_sequence(VL_TEMPLATE, CDR_POS_L, mut_fraction, rng)
-
-            # Construct scFv: VH - (GGGGS)3 - VL
-            linker = "GGGGS" * 3
-            fv_seq = vh_mut + linker + vl_mut
 
-            var_name = f"tezepelumab_var_{i:04d}"
+        fv_buf, cx_buf = [], []
+        for var_name, fv_seq in records:
+            name_b = var_name.encode("ascii")
 
             # 1. Fv FASTA (Single chain)
-            f_fv.write(f">{var_name}_fv\n")
-            f_fv.write(fv_seq + "\n")
+            fv_buf.append(b">" + name_b + b"_fv\n" + fv_seq + b"\n")
 
             # 2. Complex FASTA (ColabFold multimer format: separated by colon)
-            f_cx.write(f">{var_name}_complex\n")
-            f_cx.write(f"{fv_seq}:{TSLP_SEQ}\n")
+            cx_buf.append(b">" + name_b + b"_complex\n" + fv_seq + COMPLEX_SUFFIX_BYTES + b"\n")
+
+            if len(fv_buf) >= WRITE_CHUNK:
+                f_fv.writelines(fv_buf)
+                f_cx.writelines(cx_buf)
+                fv_buf.clear()
+                cx_buf.clear()
+
+        f_fv.writelines(fv_buf)
+        f_cx.writelines(cx_buf)
 
     print(f"[SUCCESS] Library generation complete.")
     print(f"   - Fv FASTA      : {fv_fasta}")
@@ -177,4 +311,11 @@ def main():
     )
     parser.add_argument("-n", "--n_variants", type=int, default=100, help="Number of variants (default: 100)")
     parser.add_argument("--prefix", type=str, default="tezepelumab_lib", help="Output prefix")
-    parser.
\ No newline at end of file
+    parser.add_argument("--mut_fraction", type=float, default=0.02, help="Target mutation rate")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    generate_library(args.n_variants, args.prefix, args.mut_fraction, args.seed)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
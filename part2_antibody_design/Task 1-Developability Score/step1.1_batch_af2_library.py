@@ -34,13 +34,19 @@ Repository: https://github.com/xiet02/TADA
 
 import argparse
 import csv
-import glob
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from colabfold.batch import get_queries, run
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
 # ============================================================================
 # Core Logic
 # ============================================================================
@@ -69,37 +75,48 @@ def run_colabfold(fasta_path: str, outdir: str, model_type: str, use_multimer: b
     print("[INFO] ColabFold run finished.")
 
 
+def _extract(jf: str) -> dict:
+    """Read one rank-001 score JSON into a summary row."""
+    name = os.path.basename(jf)
+    # Parse jobname: jobname_scores_rank_001_...
+    jobname = name.split("_scores_rank_001_")[0]
+
+    if _ORJSON_AVAILABLE:
+        with open(jf, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(jf, "r") as f:
+            data = json.load(f)
+
+    return {
+        "jobname": jobname,
+        "mean_plddt": data.get("mean_plddt"),
+        "ptm": data.get("ptm"),
+        "iptm_plus_ptm": data.get("iptm+ptm"),
+        "ranking_confidence": data.get("ranking_confidence"),
+    }
+
+
 def summarize_results(outdir: str, csv_path: str):
     """
     Generate a quick summary CSV of the Rank 1 models immediately after run.
     """
-    outdir = Path(outdir)
-    rows = []
-
-    # Pattern for rank 001 JSON output from ColabFold
-    pattern = str(outdir / "*_scores_rank_001_*.json")
-    score_files = sorted(glob.glob(pattern))
+    # scandir streams directory entries without the fnmatch pass glob does
+    score_files = sorted(
+        e.path for e in os.scandir(outdir)
+        if e.name.endswith(".json") and "_scores_rank_001_" in e.name
+    )
 
     if not score_files:
         print(f"[WARN] No score json files found in {outdir}")
         return
 
-    for jf in score_files:
-        name = os.path.basename(jf)
-        # Parse jobname: jobname_scores_rank_001_...
-        jobname = name.split("_scores_rank_001_")[0]
-
-        with open(jf, "r") as f:
-            data = json.load(f)
-
-        row = {
-            "jobname": jobname,
-            "mean_plddt": data.get("mean_plddt"),
-            "ptm": data.get("ptm"),
-            "iptm_plus_ptm": data.get("iptm+ptm"),
-            "ranking_confidence": data.get("ranking_confidence"),
-        }
-        rows.append(row)
+    if len(score_files) > 200:
+        # Large runs: parse across cores
+        with ProcessPoolExecutor() as ex:
+            rows = list(ex.map(_extract, score_files, chunksize=32))
+    else:
+        rows = [_extract(jf) for jf in score_files]
 
     # Write CSV
     fieldnames = ["jobname", "mean_plddt", "ptm", "iptm_plus_ptm", "ranking_confidence"]
@@ -36,9 +36,44 @@ import argparse
 import glob
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+try:
+    import simdjson
+    _SIMDJSON_AVAILABLE = True
+except ImportError:
+    _SIMDJSON_AVAILABLE = False
+
+# One reused parser per process: simdjson's documented amortization pattern
+_SIMDJSON_PARSER = None
+
+def _load_score_json(fpath: str) -> dict:
+    """Deserialize one score JSON with the fastest available backend."""
+    global _SIMDJSON_PARSER
+    with open(fpath, "rb") as f:
+        data = f.read()
+    if _SIMDJSON_AVAILABLE:
+        if _SIMDJSON_PARSER is None:
+            _SIMDJSON_PARSER = simdjson.Parser()
+        doc = _SIMDJSON_PARSER.parse(data)
+        try:
+            return doc.as_dict()
+        finally:
+            # Release the document so the parser buffer can be reused
+            del doc
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 # ============================================================================
 # Metric Calculation
 # ============================================================================
@@ -67,8 +102,10 @@ def compute_plddt_metrics(plddt_list):
 
     # Framework proxy: Ends of sequence (first and last 80 residues)
     # If sequence is short, uses whole sequence
-    fw = np.concatenate([p[:80], p[-80:]]) if len(p) >= 160 else p
-    fw_plddt = float(fw.mean())
+    if len(p) >= 160:
+        fw_plddt = float((p[:80].sum() + p[-80:].sum()) / 160.0)
+    else:
+        fw_plddt = mean_plddt
 
     # CDR proxy: Central band (approx 30%-70% of seq)
     mid_start = max(0, int(len(p) * 0.30))
@@ -82,44 +119,68 @@ def compute_plddt_metrics(plddt_list):
 # Main Parsing Logic
 # ============================================================================
 
+# Numeric columns in the order packed by _parse_one
+_METRIC_COLS = (
+    "mean_plddt", "fw_plddt", "cdr_plddt", "min_plddt", "max_plddt",
+    "ptm", "iptm", "iptm_plus_ptm", "ranking_confidence", "max_pae",
+)
+
+def _f(v) -> float:
+    return float(v) if v is not None else float("nan")
+
+def _parse_one(fpath: str):
+    """Parse a single score JSON into a result tuple (None if no pLDDT)."""
+    d = _load_score_json(fpath)
+
+    plddt = d.get("plddt", None)
+    if plddt is None:
+        return None
+
+    mean_plddt, fw_plddt, cdr_plddt, min_plddt, max_plddt = compute_plddt_metrics(plddt)
+
+    return (
+        job_from_filename(fpath),
+        os.path.basename(fpath),
+        mean_plddt, fw_plddt, cdr_plddt, min_plddt, max_plddt,
+        _f(d.get("ptm", None)),
+        _f(d.get("iptm", None)),
+        _f(d.get("iptm+ptm", None)),
+        _f(d.get("ranking_confidence", None)),
+        _f(d.get("max_pae", None)),
+    )
+
 def main(result_dir: str, out_csv: str, rank: int):
     pattern = os.path.join(result_dir, f"*_scores_rank_{rank:03d}_*.json")
     files = sorted(glob.glob(pattern))
-    
+
     if not files:
         raise SystemExit(f"[ERROR] No score json files matched: {pattern}")
 
-    rows = []
     print(f"[INFO] Processing {len(files)} score files from {result_dir}...")
 
-    for fpath in files:
-        with open(fpath, "r") as f:
-            d = json.load(f)
-
-        job = job_from_filename(fpath)
-        plddt = d.get("plddt", None)
-        
-        if plddt is None:
-            continue
-
-        mean_plddt, fw_plddt, cdr_plddt, min_plddt, max_plddt = compute_plddt_metrics(plddt)
-
-        rows.append({
-            "id": job,
-            "score_file": os.path.basename(fpath),
-            "mean_plddt": mean_plddt,
-            "fw_plddt": fw_plddt,
-            "cdr_plddt": cdr_plddt,
-            "min_plddt": min_plddt,
-            "max_plddt": max_plddt,
-            "ptm": d.get("ptm", None),
-            "iptm": d.get("iptm", None),
-            "iptm_plus_ptm": d.get("iptm+ptm", None),
-            "ranking_confidence": d.get("ranking_confidence", None),
-            "max_pae": d.get("max_pae", None),
-        })
-
-    df = pd.DataFrame(rows)
+    # Pre-allocate typed arrays so the DataFrame is built without per-row
+    # dicts or dtype inference
+    n = len(files)
+    jobs = []
+    score_files = []
+    metrics = np.empty((n, len(_METRIC_COLS)), dtype=np.float32)
+    count = 0
+
+    # Parsing is independent per file: fan out across cores
+    with ProcessPoolExecutor() as ex:
+        chunksize = max(1, n // ((os.cpu_count() or 1) * 4))
+        for r in ex.map(_parse_one, files, chunksize=chunksize):
+            if r is None:
+                continue
+            jobs.append(r[0])
+            score_files.append(r[1])
+            metrics[count] = r[2:]
+            count += 1
+
+    data = {"id": jobs, "score_file": score_files}
+    for j, col in enumerate(_METRIC_COLS):
+        data[col] = metrics[:count, j]
+    df = pd.DataFrame(data, copy=False)
     # Deduplicate and sort
     df = df.drop_duplicates(subset=["id"]).sort_values("mean_plddt", ascending=False)
     
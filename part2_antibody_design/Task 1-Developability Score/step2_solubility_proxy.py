@@ -22,7 +22,7 @@ Requirements:
 -------------
 - pandas
 - numpy
-- biopython
+- scipy
 
 Usage:
 ------
@@ -39,7 +39,32 @@ from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-from Bio import SeqIO
+from scipy.special import expit
+
+# ============================================================================
+# FASTA I/O
+# ============================================================================
+
+def fast_fasta_iter(path: str):
+    """
+    Yield (id, sequence) pairs from a FASTA file.
+
+    Lightweight replacement for Bio.SeqIO.parse: no SeqRecord/Seq object
+    construction, just string joins over a large-buffered file handle.
+    """
+    name = None
+    chunks: List[str] = []
+    with open(path, "r", buffering=1 << 20) as f:
+        for line in f:
+            if line.startswith(">"):
+                if name is not None:
+                    yield name, "".join(chunks)
+                name = line[1:].split(None, 1)[0].strip()
+                chunks = []
+            else:
+                chunks.append(line.strip())
+    if name is not None:
+        yield name, "".join(chunks)
 
 # ============================================================================
 # Constants & Scales
@@ -58,48 +83,71 @@ NEG = set("DE")
 AROM = set("FWY")
 HYDROPHOBIC_AA = set("AVILMFWYC")
 
+# 256-entry lookup tables indexed directly by ASCII code. Sequences are kept
+# as uint8 arrays so every per-residue property becomes a single C-level
+# gather + reduction instead of a Python loop.
+KD_LUT = np.zeros(256, dtype=np.float32)
+for _aa, _v in KD.items():
+    KD_LUT[ord(_aa)] = _v
+
+AROM_LUT = np.zeros(256, dtype=np.float32)
+for _aa in AROM:
+    AROM_LUT[ord(_aa)] = 1.0
+
+HYDRO_LUT = np.zeros(256, dtype=np.float32)
+for _aa in HYDROPHOBIC_AA:
+    HYDRO_LUT[ord(_aa)] = 1.0
+
+POS_LUT = np.zeros(256, dtype=np.float32)
+POS_LUT[ord("K")] = 1.0
+POS_LUT[ord("R")] = 1.0
+POS_LUT[ord("H")] = 0.1  # Histidine partial charge at pH 7.4
+
+NEG_LUT = np.zeros(256, dtype=np.float32)
+NEG_LUT[ord("D")] = 1.0
+NEG_LUT[ord("E")] = 1.0
+
+ALLOWED_BYTES = frozenset(ord(aa) for aa in KD)
+
+# Deletion table: every byte that is not a standard amino-acid code, so
+# cleaning is one C-level translate pass instead of a per-char filter
+DEL_BYTES = bytes(c for c in range(256) if c not in ALLOWED_BYTES)
+
 # ============================================================================
 # Scoring Logic
 # ============================================================================
 
-def clean_seq(seq: str) -> str:
-    """Normalize sequence to uppercase standard amino acids."""
-    seq = seq.strip().upper()
-    allowed = set(KD.keys())
-    return "".join([aa for aa in seq if aa in allowed])
+def clean_seq(seq: str) -> bytes:
+    """Normalize sequence to uppercase standard amino acids (as bytes)."""
+    return seq.upper().encode("ascii", "ignore").translate(None, DEL_BYTES)
 
-def mean_hydrophobicity(seq: str) -> float:
-    vals = [KD[aa] for aa in seq]
-    return float(np.mean(vals)) if vals else float("nan")
+def mean_hydrophobicity(arr: np.ndarray) -> float:
+    return float(KD_LUT[arr].mean()) if arr.size else float("nan")
 
-def net_charge_proxy(seq: str) -> float:
+def net_charge_proxy(arr: np.ndarray) -> float:
     """Approximate net charge at pH 7.4 (Histidine = +0.1)."""
-    k = seq.count("K")
-    r = seq.count("R")
-    h = seq.count("H")
-    d = seq.count("D")
-    e = seq.count("E")
-    return (k + r + 0.1 * h) - (d + e)
+    return float(POS_LUT[arr].sum() - NEG_LUT[arr].sum())
 
 def sigmoid(x: float) -> float:
     return 1.0 / (1.0 + math.exp(-x))
 
-def solubility_score(seq: str) -> Tuple[float, Dict[str, float]]:
+def solubility_score(seq: bytes) -> Tuple[float, Dict[str, float]]:
     """
     Calculate solubility score [0,1].
-    
+
     Logic:
     1. Calculate phys-chem properties.
     2. Normalize properties into penalty terms (0=good, 1=bad).
     3. Weighted sum of penalties.
     4. Final Score = 1 - Total Penalty.
     """
-    L = len(seq)
-    mh = mean_hydrophobicity(seq)
-    nc = net_charge_proxy(seq)
-    
-    fa = sum(1 for aa in seq if aa in AROM) / L if L > 0 else 0
-    fh = sum(1 for aa in seq if aa in HYDROPHOBIC_AA) / L if L > 0 else 0
+    arr = np.frombuffer(seq, dtype=np.uint8)
+    L = arr.size
+    mh = mean_hydrophobicity(arr)
+    nc = net_charge_proxy(arr)
+
+    fa = float(AROM_LUT[arr].mean()) if L > 0 else 0
+    fh = float(HYDRO_LUT[arr].mean()) if L > 0 else 0
 
     # 1. Hydrophobicity Penalty: mh > 0.3 is bad
     p_hydro = sigmoid((mh - 0.3) * 2.0)
@@ -128,6 +176,55 @@ def solubility_score(seq: str) -> Tuple[float, Dict[str, float]]:
     }
     return score, feats
 
+# ============================================================================
+# Batch Scoring
+# ============================================================================
+
+def score_batch(ids: List[str], seqs: List[bytes]) -> pd.DataFrame:
+    """
+    Score a whole library in one vectorized NumPy pass.
+
+    Sequences are packed into a zero-padded (N, Lmax) uint8 matrix; the
+    padding byte (0) maps to 0.0 in every LUT, so sums are unaffected and
+    means are taken against the true lengths.
+    """
+    n = len(seqs)
+    lens = np.fromiter(map(len, seqs), dtype=np.int64, count=n)
+    lmax = int(lens.max()) if n else 0
+
+    M = np.zeros((n, lmax), dtype=np.uint8)
+    for i, s in enumerate(seqs):
+        M[i, : lens[i]] = np.frombuffer(s, dtype=np.uint8)
+
+    L = np.maximum(lens, 1).astype(np.float32)
+    mh = KD_LUT[M].sum(axis=1) / L
+    fa = AROM_LUT[M].sum(axis=1) / L
+    fh = HYDRO_LUT[M].sum(axis=1) / L
+    nc = POS_LUT[M].sum(axis=1) - NEG_LUT[M].sum(axis=1)
+
+    # All four penalty sigmoids in one vectorized expit over an (N, 4)
+    # stack, then the weighted sum as a single matvec
+    nc_norm = (nc / L) * 100.0
+    P = expit(np.stack([
+        (mh - 0.3) * 2.0,
+        (fa - 0.08) * 25.0,
+        (np.abs(nc_norm) - 8.0) * 0.8,
+        (fh - 0.45) * 10.0,
+    ], axis=1))
+    penalty = P @ np.array([0.45, 0.25, 0.20, 0.10], dtype=np.float32)
+
+    score = 1.0 - penalty
+    np.clip(score, 0.0, 1.0, out=score)
+
+    return pd.DataFrame({
+        "length": lens,
+        "mean_hydrophobicity": mh,
+        "net_charge_proxy": nc,
+        "frac_aromatic": fa,
+        "solubility_score": score,
+        "id": ids,
+    })
+
 # ============================================================================
 # Main Entry Point
 # ============================================================================
@@ -140,18 +237,18 @@ def main():
     parser.add_argument("-o", "--out", default="solubility_proxy.csv", help="Output CSV path")
     args = parser.parse_args()
 
-    rows: List[Dict[str, float]] = []
-    
+    ids: List[str] = []
+    seqs: List[bytes] = []
+
     print(f"[INFO] Scoring sequences from {args.fasta}...")
-    for rec in SeqIO.parse(args.fasta, "fasta"):
-        seq = clean_seq(str(rec.seq))
+    for rid, raw in fast_fasta_iter(args.fasta):
+        seq = clean_seq(raw)
         if not seq:
             continue
-        _, feats = solubility_score(seq)
-        feats["id"] = rec.id
-        rows.append(feats)
+        ids.append(rid)
+        seqs.append(seq)
 
-    df = pd.DataFrame(rows)
+    df = score_batch(ids, seqs)
     df = df.sort_values("solubility_score", ascending=False)
     df.to_csv(args.out, index=False)
     
@@ -21,7 +21,7 @@ Features:
 Requirements:
 -------------
 - pandas
-- biopython
+- numpy
 
 Usage:
 ------
@@ -34,11 +34,47 @@ Repository: https://github.com/xiet02/TADA
 
 import argparse
 import math
-import re
 from collections import defaultdict
-from Bio import SeqIO
+import numpy as np
 import pandas as pd
 
+try:
+    import ahocorasick
+    _AHOCORASICK_AVAILABLE = True
+except ImportError:
+    _AHOCORASICK_AVAILABLE = False
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# ============================================================================
+# FASTA I/O
+# ============================================================================
+
+def fast_fasta_iter(path: str):
+    """
+    Yield (id, sequence) pairs from a FASTA file.
+
+    Lightweight replacement for Bio.SeqIO.parse: no SeqRecord/Seq object
+    construction, just string joins over a large-buffered file handle.
+    """
+    name = None
+    chunks = []
+    with open(path, "r", buffering=1 << 20) as f:
+        for line in f:
+            if line.startswith(">"):
+                if name is not None:
+                    yield name, "".join(chunks)
+                name = line[1:].split(None, 1)[0].strip()
+                chunks = []
+            else:
+                chunks.append(line.strip())
+    if name is not None:
+        yield name, "".join(chunks)
+
 # ============================================================================
 # Configuration & Weights
 # ============================================================================
@@ -71,27 +107,138 @@ H3 = list(range(98 - 1, 111))
 CDR_POS_H = sorted(set(H1 + H2 + H3))
 CDR_POS_L = sorted(set(L1 + L2 + L3))
 
+def _contiguous_runs(positions):
+    """Collapse a sorted index list into [start, end) slice bounds."""
+    runs = []
+    start = prev = positions[0]
+    for p in positions[1:]:
+        if p != prev + 1:
+            runs.append((start, prev + 1))
+            start = p
+        prev = p
+    runs.append((start, prev + 1))
+    return runs
+
+# The CDR position sets are unions of contiguous ranges; extracting via
+# slices is a plain memcpy per run instead of fancy indexing
+H_RUNS = _contiguous_runs(CDR_POS_H)
+L_RUNS = _contiguous_runs(CDR_POS_L)
+
 # ============================================================================
 # Motif Detection Logic
 # ============================================================================
 
-def count_motifs(seq: str) -> dict:
-    """Scan sequence for liability motifs."""
+AA20 = "ACDEFGHIKLMNPQRSTVWY"
+_ST = {ord("S"), ord("T")}
+
+# Map every literal motif to its liability key. NN is excluded from the
+# automaton: it self-overlaps, so it is counted with str.count to keep the
+# non-overlapping semantics of the original scan.
+MOTIF_KEYS = {
+    "DG": "cdr_isomer_DG",
+    "NG": "cdr_deamid_NG",
+    "NS": "cdr_deamid_NS",
+    "NT": "cdr_deamid_NT",
+    "DP": "cdr_cleavage_DP",
+}
+# N-glycosylation sequon NXS/T (X != P), expanded to literal 3-mers
+for _x in AA20:
+    if _x == "P":
+        continue
+    MOTIF_KEYS[f"N{_x}S"] = "cdr_nglyco_NXS_T"
+    MOTIF_KEYS[f"N{_x}T"] = "cdr_nglyco_NXS_T"
+
+if _AHOCORASICK_AVAILABLE:
+    _MOTIF_AUTOMATON = ahocorasick.Automaton()
+    for _motif, _key in MOTIF_KEYS.items():
+        _MOTIF_AUTOMATON.add_word(_motif, _key)
+    _MOTIF_AUTOMATON.make_automaton()
+else:
+    _MOTIF_AUTOMATON = None
+
+# Count-vector layout returned by the numba kernel
+_NB_KEYS = (
+    "cdr_nglyco_NXS_T", "cdr_isomer_DG", "cdr_deamid_NG", "cdr_deamid_NS",
+    "cdr_deamid_NT", "cdr_deamid_NN", "cdr_cleavage_DP", "cdr_oxid_M",
+    "cdr_oxid_W",
+)
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _count_motifs_nb(a):
+        """Count all 9 liability motifs in one pass over a uint8 array."""
+        c = np.zeros(9, dtype=np.int64)
+        n = a.size
+        for i in range(n):
+            x = a[i]
+            if x == 77:        # M
+                c[7] += 1
+            elif x == 87:      # W
+                c[8] += 1
+            if i + 1 < n:
+                y = a[i + 1]
+                if x == 68:    # D
+                    if y == 71:      # DG
+                        c[1] += 1
+                    elif y == 80:    # DP
+                        c[6] += 1
+                elif x == 78:  # N
+                    if y == 71:      # NG
+                        c[2] += 1
+                    elif y == 83:    # NS
+                        c[3] += 1
+                    elif y == 84:    # NT
+                        c[4] += 1
+                    if i + 2 < n and y != 80 and (a[i + 2] == 83 or a[i + 2] == 84):
+                        c[0] += 1    # NXS/T sequon
+        # NN counted non-overlapping to match str.count
+        i = 0
+        while i < n - 1:
+            if a[i] == 78 and a[i + 1] == 78:
+                c[5] += 1
+                i += 2
+            else:
+                i += 1
+        return c
+
+    # Warm the JIT at import so the first real sequence pays no compile cost
+    _count_motifs_nb(np.frombuffer(b"NGSDGMWNN", dtype=np.uint8))
+
+def count_motifs(seq) -> dict:
+    """Scan a sequence (bytes or str) for liability motifs."""
+    if isinstance(seq, str):
+        seq = seq.encode("ascii")
     c = defaultdict(int)
 
-    # N-glycosylation NXS/T (X != P)
-    for i in range(len(seq) - 2):
-        if seq[i] == "N" and seq[i+1] != "P" and seq[i+2] in ("S", "T"):
-            c["cdr_nglyco_NXS_T"] += 1
-
-    c["cdr_isomer_DG"]   += len(re.findall("DG", seq))
-    c["cdr_deamid_NG"]   += len(re.findall("NG", seq))
-    c["cdr_deamid_NS"]   += len(re.findall("NS", seq))
-    c["cdr_deamid_NT"]   += len(re.findall("NT", seq))
-    c["cdr_deamid_NN"]   += len(re.findall("NN", seq))
-    c["cdr_cleavage_DP"] += len(re.findall("DP", seq))
-    c["cdr_oxid_M"]      += seq.count("M")
-    c["cdr_oxid_W"]      += seq.count("W")
+    if _NUMBA_AVAILABLE:
+        arr = np.frombuffer(seq, dtype=np.uint8)
+        counts = _count_motifs_nb(arr)
+        for k, v in zip(_NB_KEYS, counts):
+            c[k] += int(v)
+        return c
+
+    if _MOTIF_AUTOMATON is not None:
+        # Single O(L) DFA pass over all 2-mer/3-mer motifs at once
+        for _, key in _MOTIF_AUTOMATON.iter(seq.decode("ascii")):
+            c[key] += 1
+    else:
+        # Fallback: one C-level bytes.count scan per motif (none of these
+        # 2-mers can overlap themselves, so counts match re.findall)
+        # N-glycosylation NXS/T (X != P)
+        n_, p_ = ord("N"), ord("P")
+        for i in range(len(seq) - 2):
+            if seq[i] == n_ and seq[i+1] != p_ and seq[i+2] in _ST:
+                c["cdr_nglyco_NXS_T"] += 1
+
+        c["cdr_isomer_DG"]   += seq.count(b"DG")
+        c["cdr_deamid_NG"]   += seq.count(b"NG")
+        c["cdr_deamid_NS"]   += seq.count(b"NS")
+        c["cdr_deamid_NT"]   += seq.count(b"NT")
+        c["cdr_cleavage_DP"] += seq.count(b"DP")
+
+    c["cdr_deamid_NN"]   += seq.count(b"NN")
+    c["cdr_oxid_M"]      += seq.count(b"M")
+    c["cdr_oxid_W"]      += seq.count(b"W")
 
     return c
 
@@ -110,45 +257,45 @@ def compute_liability_risk_cdr(counts: dict, length_cdr: int) -> float:
 # Sequence Splitting
 # ============================================================================
 
-def split_scfv_vh_vl(seq: str, min_linker_len: int = 12):
+def split_scfv_vh_vl(seq: bytes, min_linker_len: int = 12):
     """
     Split scFv into VH and VL by finding the GS-linker.
-    
+
     Args:
-        seq (str): scFv sequence
+        seq (bytes): scFv sequence
         min_linker_len (int): Min length for linker detection
-        
+
     Returns:
-        tuple: (vh, linker, vl)
+        tuple: (vh, linker, vl) as bytes
     """
-    # Find longest run of G/S/P
-    best = (None, None, 0) # start, end, length
-    i, n = 0, len(seq)
-    allowed = set("GSP")
-    
-    while i < n:
-        if seq[i] in allowed:
-            j = i
-            while j < n and seq[j] in allowed:
-                j += 1
-            if (j - i) > best[2]:
-                best = (i, j, j - i)
-            i = j
-        else:
-            i += 1
-
-    if best[2] < min_linker_len:
+    # Find longest run of G/S/P via a vectorized run-length scan
+    a = np.frombuffer(seq, dtype=np.uint8)
+    m = (a == ord("G")) | (a == ord("S")) | (a == ord("P"))
+
+    # Run boundaries: +1 where a run starts, -1 where it ends
+    d = np.diff(np.concatenate(([0], m.view(np.int8), [0])))
+    starts = np.flatnonzero(d == 1)
+    ends = np.flatnonzero(d == -1)
+
+    if starts.size == 0:
+        raise ValueError("Linker too short/not found")
+
+    lengths = ends - starts
+    best = int(lengths.argmax())
+
+    if lengths[best] < min_linker_len:
         raise ValueError("Linker too short/not found")
 
-    s, e = best[0], best[1]
+    s, e = int(starts[best]), int(ends[best])
     vh = seq[:s]
     linker = seq[s:e]
     vl = seq[e:]
     
     return vh, linker, vl
 
-def extract_cdr_by_positions(domain_seq: str, positions: list) -> str:
-    return "".join([domain_seq[i] for i in positions if 0 <= i < len(domain_seq)])
+def extract_cdr_by_runs(domain_seq: bytes, runs: list) -> bytes:
+    """Join the contiguous CDR slices (slices clamp at the domain end)."""
+    return b"".join(domain_seq[a:b] for a, b in runs)
 
 # ============================================================================
 # Main Entry Point
@@ -158,19 +305,20 @@ def main(fasta, out_csv, min_linker_len):
     rows = []
     print(f"[INFO] Scanning liabilities in {fasta}...")
 
-    for rec in SeqIO.parse(fasta, "fasta"):
-        seq = str(rec.seq).upper().replace(" ", "").replace("\n", "")
+    for rid, raw in fast_fasta_iter(fasta):
+        # Sequences stay as bytes end-to-end through split/extract/count
+        seq = raw.upper().replace(" ", "").encode("ascii")
         if not seq: continue
 
-        row = {"id": rec.id}
+        row = {"id": rid}
 
         try:
             # 1. Split scFv
             vh, linker, vl = split_scfv_vh_vl(seq, min_linker_len)
-            
+
             # 2. Extract CDRs
-            vh_cdr = extract_cdr_by_positions(vh, CDR_POS_H)
-            vl_cdr = extract_cdr_by_positions(vl, CDR_POS_L)
+            vh_cdr = extract_cdr_by_runs(vh, H_RUNS)
+            vl_cdr = extract_cdr_by_runs(vl, L_RUNS)
             
             # 3. Count Motifs
             c_h = count_motifs(vh_cdr)
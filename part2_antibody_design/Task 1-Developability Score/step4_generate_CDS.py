@@ -33,7 +33,7 @@ License: MIT
 Repository: https://github.com/xiet02/TADA
 """
 
-import re
+import numpy as np
 import pandas as pd
 from Bio import SeqIO
 
@@ -55,20 +55,21 @@ OUT_TOP = "top20.fasta"
 # ID Normalization
 # ============================================================================
 
-def canon_id(x: str) -> str:
-    """Standardize variant IDs across different pipeline steps."""
-    if pd.isna(x): return None
-    s = str(x)
-    
-    # Matches: tezepelumab_var_XXXX_fv
-    m = re.search(r"(tezepelumab_var_\d{4}_fv)", s)
-    if m: return m.group(1)
+def canon_id_series(s: pd.Series) -> pd.Series:
+    """Standardize variant IDs across different pipeline steps (vectorized)."""
+    s = s.astype(str)
+
+    # IDs repeat across pipeline outputs: run the regexes once per
+    # distinct value and broadcast back through a hashed lookup
+    u = pd.Series(s.unique())
 
-    # Matches: tezepelumab_var_XXXX
-    m = re.search(r"(tezepelumab_var_\d{4})", s)
-    if m: return m.group(1) + "_fv"
+    # Matches: tezepelumab_var_XXXX_fv, else tezepelumab_var_XXXX + "_fv"
+    full = u.str.extract(r"(tezepelumab_var_\d{4}_fv)", expand=False)
+    base = u.str.extract(r"(tezepelumab_var_\d{4})", expand=False)
 
-    return s
+    canon = pd.Series(np.where(full.notna(), full, base + "_fv"), index=u.to_numpy())
+    canon = canon.fillna(pd.Series(u.to_numpy(), index=u.to_numpy()))
+    return s.map(canon)
 
 # ============================================================================
 # Main Logic
@@ -87,12 +88,15 @@ def main():
         return
 
     # 2. Normalize IDs
-    af2["id"] = af2["id"].map(canon_id)
-    sol["id"] = sol["id"].map(canon_id)
-    lia["id"] = lia["id"].map(canon_id)
-
-    # 3. Merge Data
-    df = af2.merge(sol, on="id", how="inner").merge(lia, on="id", how="inner")
+    af2["id"] = canon_id_series(af2["id"])
+    sol["id"] = canon_id_series(sol["id"])
+    lia["id"] = canon_id_series(lia["id"])
+
+    # 3. Merge Data (single index-aligned join instead of two hashed merges)
+    af2 = af2.set_index("id")
+    sol = sol.set_index("id")
+    lia = lia.set_index("id")
+    df = af2.join([sol, lia], how="inner").reset_index()
     print(f"[INFO] Merged {len(df)} variants common to all datasets.")
 
     if len(df) == 0:
@@ -100,34 +104,34 @@ def main():
 
     # 4. Hard Filters
     # pLDDT > 80, Solubility > 0.45, No Glycosylation
-    df = df[
-        (df["mean_plddt"] >= 80) &
-        (df["fw_plddt"] >= 88) &
-        (df["solubility_score"] >= 0.45) &
-        (df["cdr_nglyco_NXS_T"] == 0)
-    ].copy()
+    # One mask over the raw ndarrays; a single fancy-index copies the rows
+    mask = np.logical_and.reduce([
+        df["mean_plddt"].to_numpy() >= 80,
+        df["fw_plddt"].to_numpy() >= 88,
+        df["solubility_score"].to_numpy() >= 0.45,
+        df["cdr_nglyco_NXS_T"].to_numpy() == 0,
+    ])
+    df = df.iloc[mask].reset_index(drop=True)
     print(f"[INFO] Variants passing hard filters: {len(df)}")
 
     # 5. Calculate Scores
-    # Normalize pLDDT to 0-1
-    df["mean_plddt_n"] = df["mean_plddt"] / 100.0
-    df["fw_plddt_n"]   = df["fw_plddt"] / 100.0
-    df["cdr_plddt_n"]  = df["cdr_plddt"] / 100.0
-
-    # Structural Score
-    df["struct_score"] = 0.5*df["mean_plddt_n"] + 0.3*df["cdr_plddt_n"] + 0.2*df["fw_plddt_n"]
-    
-    # Stability Score Proxy
-    df["stability_score"] = df["fw_plddt_n"]
-
     # Composite Developability Score (CDS/DCS)
-    # Weights: 30% Structure, 25% Solubility, 25% Low Liability, 20% Stability
-    df["DCS"] = (
-        0.30 * df["struct_score"] +
-        0.25 * df["solubility_score"] +
-        0.25 * (1.0 - df["liability_risk_cdr"]) +
-        0.20 * df["stability_score"]
-    ) * 100.0
+    # Weights: 30% Structure (0.5 mean + 0.3 cdr + 0.2 fw pLDDT, /100),
+    # 25% Solubility, 25% Low Liability, 20% Stability (fw pLDDT /100).
+    # Folded into one matvec: effective per-column weights absorb the
+    # pLDDT normalization and the (1 - liability) flip (+0.25 constant).
+    arr = df[[
+        "mean_plddt", "fw_plddt", "cdr_plddt",
+        "solubility_score", "liability_risk_cdr",
+    ]].to_numpy(dtype=np.float32)
+    w = np.array([
+        0.30 * 0.5 / 100.0,               # mean_plddt
+        (0.30 * 0.2 + 0.20) / 100.0,      # fw_plddt (struct + stability)
+        0.30 * 0.3 / 100.0,               # cdr_plddt
+        0.25,                             # solubility_score
+        -0.25,                            # liability_risk_cdr
+    ], dtype=np.float32)
+    df["DCS"] = (arr @ w + 0.25) * 100.0
 
     # Sort and Save
     df = df.sort_values("DCS", ascending=False)
@@ -135,25 +139,28 @@ def main():
     print(f"[SUCCESS] Ranked candidates saved to {OUT_ALL}")
 
     # 6. Select Top Diverse Candidates
-    # Bucket by features to ensure diversity in top selection
-    df["bucket"] = (
-        pd.cut(df["solubility_score"], bins=5, labels=False).astype(str) + "_" +
-        pd.cut(df["liability_risk_cdr"], bins=5, labels=False).astype(str) + "_" +
-        pd.cut(df["cdr_plddt"], bins=5, labels=False).astype(str)
-    )
-
-    # Pick top 2 from each bucket, up to 20 total
-    top = df.groupby("bucket", as_index=False, sort=False).head(2).head(20)
+    # Bucket by features to ensure diversity in top selection.
+    # Pack the three 5-bin codes into one int16 key (base-6 digits, NaN
+    # bins -> -1) so the groupby hashes small ints, not Python strings.
+    c1 = pd.cut(df["solubility_score"], bins=5, labels=False).fillna(-1).to_numpy(np.int16)
+    c2 = pd.cut(df["liability_risk_cdr"], bins=5, labels=False).fillna(-1).to_numpy(np.int16)
+    c3 = pd.cut(df["cdr_plddt"], bins=5, labels=False).fillna(-1).to_numpy(np.int16)
+    df["bucket"] = c1 * 36 + c2 * 6 + c3
+
+    # Pick top 2 from each bucket, up to 20 total. cumcount over the
+    # int16 keys gives each row its within-bucket rank; one fancy-index
+    # on the first 20 qualifying positions replaces the chained head()s.
+    rk = df.groupby("bucket", sort=False).cumcount().to_numpy()
+    top = df.iloc[(rk < 2).nonzero()[0][:20]]
 
     # 7. Export Top FASTA
-    seqs = {rec.id: rec for rec in SeqIO.parse(FASTA_FILE, "fasta")}
-    count = 0
+    # Lazy offset-backed index: only the <=20 picked records are parsed.
+    # Iterate the id column directly - no iterrows row boxing.
+    seqs = SeqIO.index(FASTA_FILE, "fasta")
+    ids = top["id"].to_numpy()
     with open(OUT_TOP, "w") as f:
-        for _, r in top.iterrows():
-            rec = seqs.get(r["id"])
-            if rec:
-                SeqIO.write(rec, f, "fasta")
-                count += 1
+        count = SeqIO.write((seqs[i] for i in ids if i in seqs), f, "fasta")
+    seqs.close()
 
     print(f"[SUCCESS] Exported {count} top candidates to {OUT_TOP}")
 
@@ -32,6 +32,7 @@ Repository: https://github.com/xiet02/TADA
 
 import re
 import csv
+import mmap
 import argparse
 from typing import List, Tuple
 
@@ -43,27 +44,52 @@ LINKER_CANDIDATES = [
     "GGGGS" * 4,            # 20-mer
 ]
 
+# One multi-pattern scan over all candidates instead of one pass per
+# candidate; longest-first so overlapping linkers resolve deterministically
+_LINKER_SORTED = sorted(set(LINKER_CANDIDATES), key=len, reverse=True)
+
+try:
+    import ahocorasick
+    _LINKER_AUTOMATON = ahocorasick.Automaton()
+    for _lk in _LINKER_SORTED:
+        _LINKER_AUTOMATON.add_word(_lk, _lk)
+    _LINKER_AUTOMATON.make_automaton()
+except ImportError:
+    _LINKER_AUTOMATON = None
+    _LINKER_RE = re.compile("|".join(map(re.escape, _LINKER_SORTED)))
+
 def read_fasta(path: str) -> List[Tuple[str, str]]:
-    """Read FASTA and return list of (header, sequence) tuples."""
+    """
+    Read FASTA and return list of (header, sequence) tuples.
+
+    The file is memory-mapped and record boundaries are located with
+    C-level find scans; each body is cleaned with a single translate
+    pass, so no per-line Python string objects are created.
+    """
     records = []
-    cur_id = None
-    cur_seq = []
-    
-    with open(path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith(">"):
-                if cur_id is not None:
-                    records.append((cur_id, "".join(cur_seq).replace(" ", "").upper()))
-                cur_id = line[1:].split()[0] # Take first word as ID
-                cur_seq = []
-            else:
-                cur_seq.append(line)
-    
-    if cur_id is not None:
-        records.append((cur_id, "".join(cur_seq).replace(" ", "").upper()))
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return records
+
+        try:
+            pos = mm.find(b">")
+            while pos != -1:
+                hdr_end = mm.find(b"\n", pos)
+                if hdr_end == -1:
+                    break
+                nxt = mm.find(b"\n>", hdr_end)
+                body_end = len(mm) if nxt == -1 else nxt
+
+                head = mm[pos + 1:hdr_end].split()
+                cur_id = head[0].decode("ascii") if head else ""  # First word as ID
+                body = mm[hdr_end + 1:body_end].translate(None, b"\n\r ")
+                records.append((cur_id, body.decode("ascii").upper()))
+
+                pos = -1 if nxt == -1 else nxt + 1
+        finally:
+            mm.close()
     return records
 
 def split_fv(seq: str) -> Tuple[str, str, str]:
@@ -71,11 +97,21 @@ def split_fv(seq: str) -> Tuple[str, str, str]:
     Split scFv into VH and VL based on linker detection.
     Returns: (VH, VL, Linker)
     """
-    # 1. Try exact known linker candidates
-    for lk in LINKER_CANDIDATES:
-        if lk in seq:
-            vh, vl = seq.split(lk, 1)
-            return vh, vl, lk
+    # 1. Try exact known linker candidates in one linear scan
+    if _LINKER_AUTOMATON is not None:
+        best = None  # (start, -len, linker): earliest hit, longest on ties
+        for end, lk in _LINKER_AUTOMATON.iter(seq):
+            key = (end - len(lk) + 1, -len(lk), lk)
+            if best is None or key < best:
+                best = key
+        if best is not None:
+            start, _, lk = best
+            return seq[:start], seq[start + len(lk):], lk
+    else:
+        m = _LINKER_RE.search(seq)
+        if m:
+            lk = m.group(0)
+            return seq[:m.start()], seq[m.end():], lk
 
     # 2. Fallback: regex for (GGGGS){3,} plus optional tail S/SS
     # Captures standard flexible linkers with slight variations
@@ -109,13 +145,13 @@ def main():
                 print(f"[WARN] {rid}: Suspicious domain lengths (VH={len(vh)}, VL={len(vl)}). Skipping.")
                 continue
             
-            rows.append({"id": rid, "vh_seq": vh, "vl_seq": vl, "linker": lk})
+            rows.append((rid, vh, vl, lk))
         except ValueError as e:
             print(f"[WARN] {rid}: {e}")
 
     with open(args.out_csv, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=["id", "vh_seq", "vl_seq", "linker"])
-        w.writeheader()
+        w = csv.writer(f)
+        w.writerow(("id", "vh_seq", "vl_seq", "linker"))
         w.writerows(rows)
 
     print(f"[SUCCESS] Wrote {len(rows)} valid candidates to {args.out_csv}")
@@ -68,31 +68,48 @@ def main():
 
     print(f"[INFO] Found {len(fasta_paths)} complexes to model.")
 
+    # Skip if already done (heuristic: check for result existence). The
+    # remaining FASTAs are symlinked into a staging dir so colabfold_batch
+    # is invoked ONCE on the whole directory: model weights (JAX init can
+    # take >30s) load a single time instead of once per candidate.
+    staging_dir = os.path.join(args.results_dir, "_staging_fastas")
+    os.makedirs(staging_dir, exist_ok=True)
+    for old in glob.glob(os.path.join(staging_dir, "*.fasta")):
+        os.unlink(old)
+
+    pending = 0
     for fa in fasta_paths:
         cid = Path(fa).stem
-        out_dir = os.path.join(args.results_dir, cid)
-        
-        # Skip if already done (heuristic: check for done file or result existence)
-        if os.path.exists(out_dir) and glob.glob(os.path.join(out_dir, "*.pdb")):
+
+        # Directory-mode colabfold_batch writes all outputs flat into
+        # results_dir, so look for this candidate's top-ranked PDB there
+        if glob.glob(os.path.join(args.results_dir, f"{cid}*rank_001*.pdb")):
             print(f"[INFO] Skipping {cid}, results exist.")
             continue
 
-        os.makedirs(out_dir, exist_ok=True)
-
-        cmd = [
-            "colabfold_batch",
-            fa,
-            out_dir,
-            "--model-type", args.model_type,
-            "--num-models", str(args.num_models),
-            "--num-recycle", str(args.num_recycle),
-            "--random-seed", str(args.seed),
-        ]
-        
-        # Optional: Uncomment for AMBER relaxation (slower, better physical realism)
-        # cmd += ["--amber"] 
-
-        run_command(cmd, dry_run=args.dry_run)
+        os.symlink(os.path.abspath(fa), os.path.join(staging_dir, os.path.basename(fa)))
+        pending += 1
+
+    if pending == 0:
+        print("[INFO] All candidates already modeled, nothing to run.")
+        return
+
+    print(f"[INFO] Running ColabFold on {pending} pending complexes (single batch call).")
+
+    cmd = [
+        "colabfold_batch",
+        staging_dir,
+        args.results_dir,
+        "--model-type", args.model_type,
+        "--num-models", str(args.num_models),
+        "--num-recycle", str(args.num_recycle),
+        "--random-seed", str(args.seed),
+    ]
+
+    # Optional: Uncomment for AMBER relaxation (slower, better physical realism)
+    # cmd += ["--amber"]
+
+    run_command(cmd, dry_run=args.dry_run)
 
     print(f"[SUCCESS] Batch processing complete. Results: {args.results_dir}")
 
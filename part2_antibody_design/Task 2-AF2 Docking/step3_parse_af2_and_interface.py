@@ -35,17 +35,30 @@ import argparse
 import csv
 import json
 import math
+import os
 import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
 # ============================================================================
 # Helpers
 # ============================================================================
 
 def load_json(path: Path) -> Dict:
-    with path.open("r") as f:
-        return json.load(f)
+    data = path.read_bytes()
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 def mean(x: List[float]) -> Optional[float]:
     return float(sum(x) / len(x)) if x else None
@@ -74,31 +87,36 @@ def get_pae_matrix(obj: Dict) -> Optional[List[List[float]]]:
         if isinstance(v, list): return v
     return None
 
+def load_pae_matrix(path: Path) -> Optional[np.ndarray]:
+    """Load a *_predicted_aligned_error.json straight into a float32 matrix."""
+    m = get_pae_matrix(load_json(path))
+    return np.asarray(m, dtype=np.float32) if m is not None else None
+
 def parse_chain_lengths_from_pdb(pdb_path: Path) -> List[Tuple[str, int]]:
-    """Determine chain lengths from PDB ATOM records."""
-    seen = set()
-    order: List[str] = []
-    counts: Dict[str, int] = {}
-
-    with pdb_path.open("r") as f:
-        for line in f:
-            if not line.startswith("ATOM"): continue
-            if line[12:16].strip() != "CA": continue
-            
-            chain = (line[21].strip() or "_")
-            resseq = line[22:26].strip()
-            icode = (line[26].strip() or "")
-            key = (chain, resseq, icode)
-            
-            if key in seen: continue
-            seen.add(key)
-            
-            if chain not in counts:
-                counts[chain] = 0
-                order.append(chain)
-            counts[chain] += 1
-
-    return [(c, counts[c]) for c in order]
+    """Determine chain lengths from PDB ATOM records (vectorized dedup)."""
+    data = pdb_path.read_bytes()
+
+    # Fixed-width columns 21-26 hold chainID + resSeq + iCode: one 6-byte
+    # key per CA record is enough to identify a residue
+    keys = [l[21:27] for l in data.splitlines()
+            if l[:4] == b"ATOM" and l[12:16].strip() == b"CA"]
+    if not keys:
+        return []
+
+    arr = np.array(keys, dtype="S6")
+    uniq, first = np.unique(arr, return_index=True)
+    chains = uniq.astype("S1")  # leading byte of the key is the chain ID
+
+    # Per-chain residue counts, chains reported in first-seen file order
+    chain_ids, inv = np.unique(chains, return_inverse=True)
+    counts = np.bincount(inv)
+    first_seen = np.full(len(chain_ids), len(arr), dtype=np.int64)
+    np.minimum.at(first_seen, inv, first)
+
+    return [
+        (chain_ids[k].decode("ascii").strip() or "_", int(counts[k]))
+        for k in np.argsort(first_seen, kind="stable")
+    ]
 
 def mean_interface_pae_A_B(pae: List[List[float]], chain_lengths: List[Tuple[str, int]]) -> Optional[float]:
     """
@@ -106,7 +124,10 @@ def mean_interface_pae_A_B(pae: List[List[float]], chain_lengths: List[Tuple[str
     Assumes Chain A+B is Antibody (or A=Ab, B=Ag depending on complex).
     Here we calculate generic interface PAE between the first two distinct groups.
     """
-    if not pae or not chain_lengths: return None
+    if pae is None or len(pae) == 0 or not chain_lengths: return None
+
+    # One contiguous float32 matrix; block means below run in C
+    pae = np.asarray(pae, dtype=np.float32)
 
     # Determine blocks
     ranges = []
@@ -127,20 +148,18 @@ def mean_interface_pae_A_B(pae: List[List[float]], chain_lengths: List[Tuple[str
     ag_range = ranges[-1]
     ab_ranges = ranges[:-1]
     
-    vals = []
-    
     # Ag residues
     _, c_s, c_e = ag_range
-    
+
+    total = 0.0
+    count = 0
     for _, ab_s, ab_e in ab_ranges:
-        # PAE[ab][ag]
-        for i in range(ab_s, ab_e):
-            vals.extend(pae[i][c_s:c_e])
-        # PAE[ag][ab]
-        for i in range(c_s, c_e):
-            vals.extend(pae[i][ab_s:ab_e])
+        block1 = pae[ab_s:ab_e, c_s:c_e]  # PAE[ab][ag]
+        block2 = pae[c_s:c_e, ab_s:ab_e]  # PAE[ag][ab]
+        total += float(block1.sum()) + float(block2.sum())
+        count += block1.size + block2.size
 
-    return float(sum(vals) / len(vals)) if vals else None
+    return total / count if count else None
 
 def safe_float(x) -> Optional[float]:
     try:
@@ -151,6 +170,50 @@ def safe_float(x) -> Optional[float]:
 # Main Logic
 # ============================================================================
 
+def process_candidate(cid: str, files: Dict[str, List[Path]]) -> Optional[Dict]:
+    """Parse one candidate's rank-001 outputs into a metrics row."""
+    # Find Rank 001 files
+    scores_f = sorted([f for f in files.get("scores", []) if "rank_001" in f.name])
+    pae_f    = sorted([f for f in files.get("pae", []) if "rank_001" in f.name])
+    pdb_f    = sorted([f for f in files.get("pdb", []) if "rank_001" in f.name])
+
+    if not scores_f: return None
+
+    # Load Data
+    sj = load_json(scores_f[0])
+
+    # Metrics
+    plddt = pick_float_or_mean(sj, "plddt")
+    ptm   = pick_float_or_mean(sj, "ptm")
+    iptm  = pick_float_or_mean(sj, "iptm")
+
+    # PAE Matrix
+    pae_matrix = get_pae_matrix(sj)
+    if pae_matrix is None and pae_f:
+        pae_matrix = load_pae_matrix(pae_f[0])
+
+    # Interface PAE
+    iface_pae = None
+    chain_lens = []
+    if pdb_f and pdb_f[0].exists():
+        chain_lens = parse_chain_lengths_from_pdb(pdb_f[0])
+        if pae_matrix is not None:
+            iface_pae = mean_interface_pae_A_B(pae_matrix, chain_lens)
+
+    return {
+        "candidate_id": cid,
+        "plddt": safe_float(plddt),
+        "ptm": safe_float(ptm),
+        "iptm": safe_float(iptm),
+        "mean_interface_pae": safe_float(iface_pae),
+        "chain_lengths": ";".join([f"{c}:{n}" for c, n in chain_lens]),
+        "pdb_path": str(pdb_f[0]) if pdb_f else ""
+    }
+
+def _process_item(item) -> Optional[Dict]:
+    """Starred adapter so candidates.items() maps cleanly across workers."""
+    return process_candidate(*item)
+
 def main():
     parser = argparse.ArgumentParser(description="Extract AF2 docking metrics.")
     parser.add_argument("--results_dir", required=True, help="ColabFold output folder")
@@ -164,65 +227,40 @@ def main():
     # 1. Group files by candidate
     # Pattern: candidate_id_complex_scores_rank_...
     # We scan recursively
-    candidates = {}
+    candidates = defaultdict(lambda: defaultdict(list))
     print(f"[INFO] Scanning {root}...")
-    
-    for p in root.rglob("*"):
-        if not p.is_file(): continue
-        # Heuristic ID extraction
-        # Assumes filenames start with candidate ID
-        if "_scores" in p.name:
-            # teze_var_01_complex_scores_rank_001...
-            cid = p.name.split("_scores")[0]
-            candidates.setdefault(cid, {})["scores"] = candidates.get(cid, {}).get("scores", []) + [p]
-        elif "_predicted_aligned_error" in p.name:
-            cid = p.name.split("_predicted")[0]
-            candidates.setdefault(cid, {})["pae"] = candidates.get(cid, {}).get("pae", []) + [p]
-        elif p.suffix == ".pdb" and "rank_" in p.name:
-             cid = p.name.split("_unrelaxed")[0].split("_relaxed")[0]
-             candidates.setdefault(cid, {})["pdb"] = candidates.get(cid, {}).get("pdb", []) + [p]
+
+    # Heuristic ID extraction: filenames start with the candidate ID.
+    # os.walk avoids rglob's per-entry stat and one precompiled regex
+    # classifies each filename; Path objects are built only for matches.
+    # e.g. teze_var_01_complex_scores_rank_001...
+    pat = re.compile(
+        r"^(?P<cid>.+?)"
+        r"(?:(?P<scores>_scores)"
+        r"|(?P<pae>_predicted_aligned_error)"
+        r"|(?P<pdb>_(?:un)?relaxed_rank_\d+.*\.pdb$))"
+    )
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for fn in filenames:
+            m = pat.match(fn)
+            if not m: continue
+            cid = m.group("cid")
+            if m.group("scores"):
+                candidates[cid]["scores"].append(Path(dirpath, fn))
+            elif m.group("pae"):
+                candidates[cid]["pae"].append(Path(dirpath, fn))
+            else:
+                candidates[cid]["pdb"].append(Path(dirpath, fn))
 
     print(f"[INFO] Found {len(candidates)} candidates.")
 
     # 2. Process Best Rank
-    for cid, files in sorted(candidates.items()):
-        # Find Rank 001 files
-        scores_f = sorted([f for f in files.get("scores", []) if "rank_001" in f.name])
-        pae_f    = sorted([f for f in files.get("pae", []) if "rank_001" in f.name])
-        pdb_f    = sorted([f for f in files.get("pdb", []) if "rank_001" in f.name])
-
-        if not scores_f: continue
-        
-        # Load Data
-        sj = load_json(scores_f[0])
-        
-        # Metrics
-        plddt = pick_float_or_mean(sj, "plddt")
-        ptm   = pick_float_or_mean(sj, "ptm")
-        iptm  = pick_float_or_mean(sj, "iptm")
-
-        # PAE Matrix
-        pae_matrix = get_pae_matrix(sj)
-        if pae_matrix is None and pae_f:
-             pae_matrix = get_pae_matrix(load_json(pae_f[0]))
-
-        # Interface PAE
-        iface_pae = None
-        chain_lens = []
-        if pdb_f and pdb_f[0].exists():
-            chain_lens = parse_chain_lengths_from_pdb(pdb_f[0])
-            if pae_matrix:
-                iface_pae = mean_interface_pae_A_B(pae_matrix, chain_lens)
-
-        rows.append({
-            "candidate_id": cid,
-            "plddt": safe_float(plddt),
-            "ptm": safe_float(ptm),
-            "iptm": safe_float(iptm),
-            "mean_interface_pae": safe_float(iface_pae),
-            "chain_lengths": ";".join([f"{c}:{n}" for c,n in chain_lens]),
-            "pdb_path": str(pdb_f[0]) if pdb_f else ""
-        })
+    # Candidates are independent (JSON parse + NumPy block math): fan out
+    # across cores and keep only the candidates that had score files
+    with ProcessPoolExecutor() as ex:
+        for row in ex.map(_process_item, sorted(candidates.items()), chunksize=8):
+            if row is not None:
+                rows.append(row)
 
     # 3. Export
     keys = ["candidate_id", "plddt", "ptm", "iptm", "mean_interface_pae", "chain_lengths", "pdb_path"]
@@ -43,13 +43,16 @@ import numpy as np
 import pandas as pd
 
 def norm_minmax(series: pd.Series) -> pd.Series:
-    """Normalize a series to [0,1]."""
-    x = pd.to_numeric(series, errors="coerce")
-    if x.notna().sum() == 0:
-        return pd.Series([0.0]*len(series), index=series.index)
-    lo, hi = float(np.nanmin(x.values)), float(np.nanmax(x.values))
-    if hi == lo: return pd.Series([0.0]*len(series), index=series.index)
-    return (x - lo) / (hi - lo)
+    """Normalize a series to [0,1] (in-place ndarray math, no temp Series)."""
+    x = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, copy=True)
+    if np.isnan(x).all():
+        return pd.Series(np.zeros(len(series)), index=series.index)
+    lo, hi = float(np.nanmin(x)), float(np.nanmax(x))
+    if hi == lo:
+        return pd.Series(np.zeros(len(series)), index=series.index)
+    x -= lo
+    x /= (hi - lo)
+    return pd.Series(x, index=series.index)
 
 def main():
     parser = argparse.ArgumentParser(description="Merge scores and rank candidates.")
@@ -82,11 +85,12 @@ def main():
     
     # 3. Merge
     print(f"[INFO] Merging {len(dev)} dev records with {len(dock)} docking records...")
-    # Attempt cleanup if standard merge fails
-    if not set(dev["candidate_id"]) & set(dock["candidate_id"]):
+    # Attempt cleanup if standard merge fails; isin short-circuits on the
+    # first shared ID instead of materializing two full ID sets
+    if not dev["candidate_id"].isin(dock["candidate_id"]).any():
          print("[WARN] ID mismatch detected. Attempting to strip suffixes...")
-         dev["candidate_id"] = dev["candidate_id"].astype(str).str.replace("_fv", "").str.replace("_complex", "")
-         dock["candidate_id"] = dock["candidate_id"].astype(str).str.replace("_fv", "").str.replace("_complex", "")
+         dev["candidate_id"] = dev["candidate_id"].astype(str).str.replace(r"_fv|_complex", "", regex=True)
+         dock["candidate_id"] = dock["candidate_id"].astype(str).str.replace(r"_fv|_complex", "", regex=True)
 
     m = dev.merge(dock, on="candidate_id", how="inner")
     
@@ -105,11 +109,11 @@ def main():
     m["pae_norm"] = norm_minmax(m["mean_interface_pae"])
 
     # 6. Final Composite Score
-    # Score = (Dev * w1) + (iPTM * w2) - (PAE * w3)
+    # Score = (Dev * w1) + (iPTM * w2) - (PAE * w3), as one matvec over
+    # the three normalized columns instead of three Series temporaries
     m["final_score"] = (
-        args.w_dev * m["dev_norm"] + 
-        args.w_iptm * m["iptm_norm"] - 
-        args.w_pae * m["pae_norm"]
+        m[["dev_norm", "iptm_norm", "pae_norm"]].to_numpy(dtype=np.float64)
+        @ np.array([args.w_dev, args.w_iptm, -args.w_pae])
     )
 
     # 7. Rank & Export